@@ -1,18 +1,102 @@
+import time
+# Startup phases in seconds (import, load, snapshot, layout, warm_up), reported on /metrics
+STARTUP_TIMINGS = {}
+_start = time.perf_counter()
 import dash
-from dash import dcc, html, Output, Input,dash_table
+from dash import dcc, html, Output, Input, State,dash_table, ClientsideFunction
+from dash.exceptions import PreventUpdate
 import plotly.express as px
 import pandas as pd
 import plotly.graph_objects as go
 import numpy as np
 import os
+import contextlib
+from data_store import (
+    load_clean_data, load_raw_data, load_raw_metadata, MONTH_ORDER,
+    CLEAN_CSV, CLEAN_STORE, GAZETTEER, RAW_CSV, RAW_METADATA, RAW_STORE,
+)
+from data_watcher import DataWatcher
+from snapshot import DatasetSnapshot, current_snapshot, publish
+from figure_cache import FigureCache, all_subsets, ignore_inputs, ordered_subset, serialize_figure
+from figure_theme import register_template
+from token_index import wordcloud_image
+from cross_filter import normalize_filter_state
+from point_map import DEFAULT_VIEW, bin_points, cell_size, map_view, wrap_longitude
+from metrics import instrument
+from profiling import profile_callbacks, profiler_from_env
+from compression import compress_callbacks
 ##############################################################################################################################
-# Load the data for the dashboard
-airplane_data = pd.read_csv("Data/Airplane_Crashes_and_Fatalities_Since_1908.csv")
-airplane_data_clean = pd.read_csv("Data/cleaned_airplane_crashes.csv")
+# Load the data for the dashboard (typed Feather store, falls back to the CSV files).
+# Derived columns and aggregates are computed once into a read-only snapshot;
+# callbacks only read from current_snapshot().
+# The raw dataset is only loaded for the data table; the home tab reads its metadata file.
+# With PROFILE_STARTUP=1 both steps are profiled (profiling.py)
+STARTUP_TIMINGS["import"] = time.perf_counter() - _start
+profiler = profiler_from_env()
+with profiler.profile("startup") if os.environ.get("PROFILE_STARTUP") == "1" else contextlib.nullcontext():
+    _start = time.perf_counter()
+    _clean, _raw_metadata = load_clean_data(), load_raw_metadata()
+    STARTUP_TIMINGS["load"] = time.perf_counter() - _start
+    _start = time.perf_counter()
+    publish(DatasetSnapshot(load_raw_data, _clean, _raw_metadata))
+    STARTUP_TIMINGS["snapshot"] = time.perf_counter() - _start
+del _clean, _raw_metadata
+_start = time.perf_counter()
+
+# Shared dark styling of every figure (figure_theme.py)
+register_template()
+
+# Serialized figures keyed by (callback, normalized inputs, data version)
+figure_cache = FigureCache(
+    maxsize=int(os.environ.get("FIGURE_CACHE_SIZE", 128)),
+    version=lambda: current_snapshot().version
+)
+# Map views have no bounded input space: their own cache keeps panning from evicting the charts
+map_cache = FigureCache(maxsize=64, version=lambda: current_snapshot().version)
+METRIC_OPTIONS = ["Accidents", "Fatalities"]
+OPERATOR_TYPES = ["Civilian", "Military"]
+TABLE_PAGE_SIZE = 10
+DEFAULT_SEARCH_DATE = "06/08/2009"
+DEFAULT_RADIUS_KM = 50
+MAX_RADIUS_KM = 5000
+MAX_LISTED_CRASHES = 20
+
+# Optional warm-up so that no user request pays for loading the data or rendering a figure
+WARM_FIGURE_CACHE = os.environ.get("WARM_FIGURE_CACHE") == "1"
+# Reload the data when the files in Data/ change
+DATA_WATCH = os.environ.get("DATA_WATCH", "1") == "1"
+
+# Time charts re-sliced in the browser (assets/clientside_charts.js) from a payload sent once
+CLIENTSIDE_CHARTS = os.environ.get("CLIENTSIDE_CHARTS") == "1"
+METRIC_COLORS = ["#E97451", "#800020"]
 
 #############################################################################################################################
 # Initialize the Dash app
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
+# WSGI entry point for gunicorn (gunicorn.conf.py)
+server = app.server
+
+# Profiles of the callbacks selected with PROFILE_CALLBACKS / PROFILE_HEADER, registered
+# first so that they include the metrics and compression hooks
+profile_callbacks(app, profiler)
+
+# Per-callback latency, response size and exceptions, served on /metrics
+metrics = instrument(app)
+for _phase in ["import", "load", "snapshot", "layout", "warm_up"]:
+    metrics.add_metric("dashboard_startup_seconds", "Time spent in each startup phase.", "gauge",
+                       lambda phase=_phase: STARTUP_TIMINGS.get(phase, 0.0), phase=_phase)
+# From the metadata file, so that scraping never loads the raw dataset (NaN until it is known)
+metrics.add_metric("dashboard_dataset_rows", "Rows of the served dataset.", "gauge",
+                   lambda: current_snapshot().raw_row_count(), frame="raw")
+metrics.add_metric("dashboard_dataset_rows", "Rows of the served dataset.", "gauge",
+                   lambda: len(current_snapshot().clean), frame="clean")
+metrics.add_metric("dashboard_snapshot_version", "Version of the served dataset snapshot.", "gauge",
+                   lambda: current_snapshot().version)
+metrics.add_metric("dashboard_figure_cache_hits_total", "Figure cache hits.", "counter", lambda: figure_cache.hits)
+metrics.add_metric("dashboard_figure_cache_misses_total", "Figure cache misses.", "counter", lambda: figure_cache.misses)
+
+# gzip/brotli callback responses; registered after the metrics so that they record the bytes sent
+compress_callbacks(app)
 
 ##############################################################################################################################
 #define styles for the app
@@ -98,6 +182,7 @@ title_style = {
 ##############################################################################################################################
 # Define the Home tab content
 def home_tab():
+    raw_rows, raw_columns = current_snapshot().raw_overview(TABLE_PAGE_SIZE)[:2]
     return html.Div([
         html.H2([
             "Welcome to the Airplane Crashes Analysis Dashboard – ",
@@ -188,7 +273,7 @@ def home_tab():
             # Total Records Box
             html.Div([
                 html.Div("Total Records", style={"color": "#FAFAFA", "fontSize": "24px", "marginBottom": "10px"}),
-                html.Div(f"{len(airplane_data):,}", style={"color": "#FF4B4B", "fontWeight": "bold", "fontSize": "24px"})
+                html.Div(f"{raw_rows:,}", style={"color": "#FF4B4B", "fontWeight": "bold", "fontSize": "24px"})
             ], style={
                 "width": "20%",
                 "display": "inline-block",
@@ -203,7 +288,7 @@ def home_tab():
             # Columns Box
             html.Div([
                 html.Div("Columns", style={"color": "#FAFAFA", "fontSize": "24px", "marginBottom": "10px"}),
-                html.Div(f"{len(airplane_data.columns)}", style={"color": "#FF4B4B", "fontWeight": "bold", "fontSize": "24px"})
+                html.Div(f"{len(raw_columns)}", style={"color": "#FF4B4B", "fontWeight": "bold", "fontSize": "24px"})
             ], style={
                 "width": "20%",
                 "display": "inline-block",
@@ -238,7 +323,7 @@ def home_tab():
         }),
 
         html.H4(
-            "Sample Data (First 10 Records):",
+            "Raw Data (sort and filter every record):",
             style={
                 "color": "#FFFFFF",
                 "fontSize": "20px",
@@ -248,7 +333,7 @@ def home_tab():
             }
         ),
 
-        html.Div(id='data-table-container'),
+        html.Div(get_data_table(), id='data-table-container'),
 
         html.Div([
             html.Div([
@@ -326,7 +411,81 @@ def home_tab():
 
 
 # Define the EDA tab content
+def lazy_section(component):
+    """
+    Wrap a chart so that its figure is only requested once it scrolls into view:
+    assets/lazy_sections.js sets the "<id>-visible" store, which fires the chart's
+    callback (see lazy_chart_callback).
+    """
+    store_id = f"{component.id}-visible"
+    return html.Div(
+        [dcc.Store(id=store_id, data=False), component],
+        className="lazy-section",
+        **{"data-visible-store": store_id}
+    )
+
+
+def filter_bar(snap):
+    # Filters shared by every chart of the EDA tab (an empty dropdown means no filter)
+    first_year, last_year = int(snap.cross_filter.years[0]), int(snap.cross_filter.years[-1])
+    dropdown_style = {"flex": "1", "minWidth": "180px", "color": "#0A0A0A", "fontSize": "16px"}
+    return html.Div([
+        html.H3("🎛️ Filters:", style={"color": "#FFFFFF", "fontSize": "22px", "fontWeight": "600", "margin": "0 0 10px 0"}),
+        dcc.RangeSlider(
+            id='filter-years',
+            min=first_year,
+            max=last_year,
+            step=1,
+            value=[first_year, last_year],
+            marks={year: str(year) for year in range(first_year // 10 * 10 + 10, last_year + 1, 10)},
+            tooltip={"placement": "bottom"}
+        ),
+        html.Div([
+            dcc.Dropdown(
+                id='filter-operator-types',
+                options=[{"label": operator_type, "value": operator_type} for operator_type in OPERATOR_TYPES],
+                multi=True,
+                placeholder="All operator types",
+                style=dropdown_style
+            ),
+            dcc.Dropdown(
+                id='filter-countries',
+                options=[{"label": name, "value": name} for name in sorted(snap.cross_filter.bitmaps["countries"])],
+                multi=True,
+                placeholder="All countries",
+                style=dropdown_style
+            ),
+            dcc.Dropdown(
+                id='filter-causes',
+                options=[{"label": cause, "value": cause} for cause in snap.cause_index.causes],
+                multi=True,
+                placeholder="All causes",
+                style=dropdown_style
+            ),
+            dcc.Dropdown(
+                id='filter-months',
+                options=[{"label": month, "value": month} for month in MONTH_ORDER],
+                multi=True,
+                placeholder="All months",
+                style=dropdown_style
+            ),
+        ], style={"display": "flex", "gap": "15px", "flexWrap": "wrap", "marginTop": "15px"}),
+        dcc.Store(id='filter-state'),
+    ], style={
+        "position": "sticky",
+        "top": "0",
+        "zIndex": "10",
+        "backgroundColor": "#0C1016",
+        "padding": "20px 30px",
+        "borderRadius": "10px",
+        "marginBottom": "40px",
+        "boxShadow": "0 4px 8px rgba(0, 0, 0, 0.2)"
+    })
+
+
 def eda_tab():
+    snap = current_snapshot()
+    airplane_data_clean = snap.clean
     return html.Div([
         html.P([
             "Airplane crashes have long captured public attention due to their tragic consequences and complex causes. This dashboard takes you on an "
@@ -372,6 +531,8 @@ def eda_tab():
             "boxShadow": "0 4px 8px rgba(0,0,0,0.2)"
         }),
 
+        filter_bar(snap),
+
         html.Div([
             html.Div(
                 html.P("Are there specific periods when airplane crashes were more frequent? This section breaks down the data by year, month, and time of day to uncover temporal patterns and trends. "
@@ -394,7 +555,8 @@ def eda_tab():
                 labelStyle={'display': 'inline-block', 'marginRight': '20px',"fontSize": "19px"},
                 style={'color': 'white', 'marginBottom': '5px'}
             ),
-            dcc.Graph(id='accident-time-series', style={"height": "500px"}),
+            dcc.Store(id='chart-payload', data=chart_payload() if CLIENTSIDE_CHARTS else None),
+            lazy_section(dcc.Graph(id='accident-time-series', style={"height": "500px"})),
 
             html.Div([
                 dcc.Checklist(
@@ -410,10 +572,10 @@ def eda_tab():
                 ),
                 html.Div([
                     html.Div([
-                        dcc.Graph(id="crash-time-pie-chart")
+                        lazy_section(dcc.Graph(id="crash-time-pie-chart"))
                     ], style={"width": "38%", "padding": "10px"}),
                     html.Div([
-                        dcc.Graph(id="monthly-crash-bar-chart")
+                        lazy_section(dcc.Graph(id="monthly-crash-bar-chart"))
                     ], style={"width": "58%", "padding": "10px"})
                 ], style={"display": "flex", "justifyContent": "space-between", "flexWrap": "wrap"})
             ]),
@@ -430,13 +592,13 @@ def eda_tab():
                 ),
                 dcc.DatePickerSingle(
                     id='date-picker',
-                    min_date_allowed=airplane_data_clean['Date'].min(),
-                    max_date_allowed=airplane_data_clean['Date'].max(),
-                    initial_visible_month=airplane_data_clean['Date'].max(),
-                    date="06/08/2009",
+                    min_date_allowed=airplane_data_clean['Date'].min().date(),
+                    max_date_allowed=airplane_data_clean['Date'].max().date(),
+                    initial_visible_month=airplane_data_clean['Date'].max().date(),
+                    date=DEFAULT_SEARCH_DATE,
                     style={"marginBottom": "20px"}
                 ),
-                html.Div(id='date-search-result')
+                html.Div(display_accidents_per_date(DEFAULT_SEARCH_DATE), id='date-search-result')
             ], style={
                 "backgroundColor": "#0C1016",
                 "padding": "30px",
@@ -482,8 +644,79 @@ def eda_tab():
                 }
             ),
             html.Div([
-                dcc.Graph(id='world-map')
+                lazy_section(dcc.Graph(id='world-map'))
             ], style={"height": "600px", "marginTop": "20px"}),
+            html.H5(
+                "Crash Locations:",
+                style={
+                    "color": "#FFFFFF",
+                    "fontSize": "24px",
+                    "fontWeight": "600",
+                    "marginTop": "40px"
+                }
+            ),
+            html.P("Zoom in to split the clusters down to single crashes, or select an area with the box or lasso tool.",
+                   style={"fontSize": "18px"}),
+            html.Div([
+                dcc.Store(id='crash-point-map-view'),
+                lazy_section(dcc.Graph(id='crash-point-map', config={"scrollZoom": True}, responsive=True,
+                                       style={"width": "100%", "height": "600px"}))
+            ], style={"height": "600px", "marginTop": "20px"}),
+            html.Div(crashes_in_selection(None, None), id='map-selection-result', style={"marginTop": "20px"}),
+
+            html.Div([
+                html.H3(
+                    "🔍 Search Accidents Near a Place:",
+                    style={
+                        "color": "#FFFFFF",
+                        "fontSize": "24px",
+                        "fontWeight": "400",
+                        "marginTop": "40px"
+                    }
+                ),
+                html.Div([
+                    dcc.Input(
+                        id='radius-center',
+                        type='text',
+                        placeholder='Enter a place name or "latitude, longitude"...',
+                        debounce=True,
+                        style={
+                            "flex": "1",
+                            "padding": "12px",
+                            "borderRadius": "5px",
+                            "fontSize": "16px",
+                            "backgroundColor": "#1E222C",
+                            "color": "#FFFFFF",
+                            "border": "0px solid #444",
+                        }
+                    ),
+                    dcc.Input(
+                        id='radius-km',
+                        type='number',
+                        value=DEFAULT_RADIUS_KM,
+                        min=1,
+                        max=MAX_RADIUS_KM,
+                        debounce=True,
+                        style={
+                            "width": "100px",
+                            "padding": "12px",
+                            "borderRadius": "5px",
+                            "fontSize": "16px",
+                            "backgroundColor": "#1E222C",
+                            "color": "#FFFFFF",
+                            "border": "0px solid #444",
+                        }
+                    ),
+                    html.Span("km", style={"color": "#FAFAFA", "fontSize": "18px"}),
+                ], style={"display": "flex", "gap": "10px", "alignItems": "center", "marginBottom": "20px"}),
+                html.Div(search_near_place(None, DEFAULT_RADIUS_KM, None), id='radius-search-result')
+            ], style={
+                "backgroundColor": "#0C1016",
+                "padding": "30px",
+                "borderRadius": "10px",
+                "marginTop": "30px",
+                "boxShadow": "0 4px 8px rgba(0, 0, 0, 0.2)"
+            }),
 
             html.Div([
                 html.Div([
@@ -501,6 +734,7 @@ def eda_tab():
                             id='country-input',
                             type='text',
                             placeholder='Enter a country name...',
+                            list='country-suggestions',
                             style={
                                 "width": "100%",
                                 "padding": "12px",
@@ -512,7 +746,8 @@ def eda_tab():
                                 "border": "0px solid #444",
                             }
                         ),
-                        html.Div(id='country-search-result')
+                        html.Datalist(id='country-suggestions'),
+                        html.Div(search_by_country(None), id='country-search-result')
                     ], style={
                         "padding": "40px",
                         "paddingright": "40px",
@@ -521,7 +756,7 @@ def eda_tab():
                         "boxShadow": "0 4px 8px rgba(0, 0, 0, 0.2)"
                     }),
                     html.Div([
-                        dcc.Graph(id="top-countries-bar-chart")
+                        lazy_section(dcc.Graph(id="top-countries-bar-chart"))
                     ], style={"width": "58%", "padding": "10px"})
                 ], style={"display": "flex", "justifyContent": "space-between", "flexWrap": "wrap"})
             ]),
@@ -556,10 +791,35 @@ def eda_tab():
                     "Common Words in Accident Summaries:",
                     style={"color": "white", "marginBottom": "30px", "fontWeight": "600", }
                 ),
-                html.Img(
+                html.Div([
+                    dcc.Dropdown(
+                        id="wordcloud-cause-filter",
+                        options=[{"label": cause, "value": cause} for cause in snap.cause_index.causes],
+                        multi=True,
+                        placeholder="All causes",
+                        style={"width": "45%", "color": "#0A0A0A", "fontSize": "16px"}
+                    ),
+                    dcc.Dropdown(
+                        id="wordcloud-decade-filter",
+                        options=[{"label": f"{decade}s", "value": decade} for decade in snap.decades()],
+                        multi=True,
+                        placeholder="All decades",
+                        style={"width": "30%", "color": "#0A0A0A", "fontSize": "16px"}
+                    ),
+                    dcc.Checklist(
+                        id="wordcloud-operator-filter",
+                        options=[{"label": operator_type, "value": operator_type} for operator_type in OPERATOR_TYPES],
+                        value=OPERATOR_TYPES,
+                        labelStyle={'display': 'inline-block', 'marginRight': '20px', "fontSize": "19px"},
+                        style={'color': 'white'}
+                    ),
+                ], style={"display": "flex", "gap": "20px", "alignItems": "center", "marginBottom": "20px"}),
+                lazy_section(html.Img(
+                    id="wordcloud-image",
                     src="/assets/wordcloud_summary.png",
+                    alt="No accident summaries match these filters.",
                     style={"width": "100%", "borderRadius": "20px", }
-                )
+                ))
             ], style={"marginBottom": "30px"}),
 
             html.Div([
@@ -572,7 +832,7 @@ def eda_tab():
                         "marginBottom": "20px"
                     }
                 ),
-                dcc.Graph(id="cause-pie-chart")
+                lazy_section(dcc.Graph(id="cause-pie-chart"))
             ], style={
                 "backgroundColor": "#0E1117"
             }),
@@ -591,7 +851,7 @@ def eda_tab():
                     id="cause-dropdown",
                     options=[
                         {"label": cause, "value": cause}
-                        for cause in sorted(airplane_data_clean['Causes'].dropna().unique())
+                        for cause in snap.cause_index.causes
                     ],
                     value=None,
                     placeholder="Select a cause...",
@@ -606,7 +866,7 @@ def eda_tab():
                     }
                 ),
 
-                html.Div(id="cause-stats", style={"color": "#FFFFFF", "marginTop": "20px", "fontSize": "18px"}),
+                html.Div(update_cause_stats(None), id="cause-stats", style={"color": "#FFFFFF", "marginTop": "20px", "fontSize": "18px"}),
 
             ], style={
                 "backgroundColor": "#0E1117",
@@ -672,9 +932,21 @@ def recommendations_tab():
     ])  
          
 def get_data_table():
+    _, columns, data, page_count = current_snapshot().raw_overview(TABLE_PAGE_SIZE)
+    # Paging, sorting and filtering run on the server: the browser only receives one page
     return dash_table.DataTable(
-        data=airplane_data.head(10).to_dict('records'),
-        columns=[{"name": i, "id": i} for i in airplane_data.columns],
+        id='raw-data-table',
+        data=data,
+        columns=[{"name": i, "id": i} for i in columns],
+        page_action='custom',
+        page_current=0,
+        page_count=page_count,
+        sort_action='custom',
+        sort_mode='multi',
+        sort_by=[],
+        filter_action='custom',
+        filter_query='',
+        filter_options={'case': 'insensitive'},
         style_table={
             'overflowX': 'auto',
             'border': '1px solid #444'
@@ -693,7 +965,12 @@ def get_data_table():
             'fontWeight': 'bold',
             'border': '1px solid #333'
         },
-        page_size=10
+        style_filter={
+            'backgroundColor': '#1E222C',
+            'color': 'white',
+            'border': '1px solid #333'
+        },
+        page_size=TABLE_PAGE_SIZE
     )
 
 def empty_figure_message(message="Please select at least one metric to display."):
@@ -708,8 +985,6 @@ def empty_figure_message(message="Please select at least one metric to display."
     )
 
     fig.update_layout(
-        plot_bgcolor="#0E1117",
-        paper_bgcolor="#0E1117",
         xaxis=dict(visible=False),
         yaxis=dict(visible=False)
     )
@@ -795,10 +1070,15 @@ app.layout = html.Div([
 })
 
 ##############################################################################################################################
+# Tab layouts, built once per data version
+layout_cache = FigureCache(maxsize=8, version=lambda: current_snapshot().version)
+
+
 @app.callback(
     Output('tabs-content', 'children'),
     Input('tabs', 'value')
 )
+@layout_cache.memoize()
 def render_content(tab):
     if tab == 'tab1':
         return home_tab()
@@ -808,24 +1088,152 @@ def render_content(tab):
         return recommendations_tab()
     
 ##############################################################################################################################
+# The tab layouts hold the initial output of the callbacks below, so rendering a tab fires none of them
 @app.callback(
-    Output('data-table-container', 'children'),
-    Input('tabs', 'value')
+    Output('raw-data-table', 'data'),
+    Output('raw-data-table', 'page_count'),
+    Output('raw-data-table', 'page_current'),
+    Input('raw-data-table', 'page_current'),
+    Input('raw-data-table', 'page_size'),
+    Input('raw-data-table', 'sort_by'),
+    Input('raw-data-table', 'filter_query'),
+    prevent_initial_call=True
 )
-def update_table(tab_value):
-    if tab_value == 'tab1':
-        return get_data_table()
-    return dash.no_update
+def update_table_page(page_current, page_size, sort_by, filter_query):
+    # A new filter or sort order starts again from the first page
+    if {'raw-data-table.sort_by', 'raw-data-table.filter_query'} & set(dash.ctx.triggered_prop_ids):
+        page_current = 0
+    # Only the requested page is sent, sliced from the cached filtered and sorted row order
+    records, page_count = current_snapshot().table_index.page(page_current, page_size, sort_by, filter_query)
+    return records, page_count, min(page_current or 0, page_count - 1)
 
 ##############################################################################################################################
 @app.callback(
+    Output('filter-state', 'data'),
+    Input('filter-years', 'value'),
+    Input('filter-operator-types', 'value'),
+    Input('filter-countries', 'value'),
+    Input('filter-causes', 'value'),
+    Input('filter-months', 'value'),
+    prevent_initial_call=True
+)
+def update_filter_state(years, operator_types, countries, causes, months):
+    # The whole year span selected means no year filter
+    cross_filter = current_snapshot().cross_filter
+    if years and years[0] <= cross_filter.years[0] and years[1] >= cross_filter.years[-1]:
+        years = None
+    return {
+        "years": years,
+        "operator_types": operator_types or [],
+        "countries": countries or [],
+        "causes": causes or [],
+        "months": months or [],
+    }
+
+
+def with_filter_state(normalize):
+    # Normalizer of a chart callback whose last input is the shared filter state
+    def normalized(*args):
+        return normalize(*args[:-1]) + (normalize_filter_state(args[-1]),)
+    return normalized
+
+
+def lazy_chart_callback(*dependencies):
+    """
+    Register a chart callback that runs once its chart has scrolled into view (see
+    lazy_section), then on every input change while it is displayed. The decorated
+    function is returned unchanged.
+    """
+    visible = Input(f"{dependencies[0].component_id}-visible", "data")
+
+    def decorator(func):
+        def callback(*args):
+            *args, is_visible = args
+            if not is_visible:
+                raise PreventUpdate
+            return func(*args)
+        callback.__name__ = func.__name__
+        app.callback(*dependencies, visible, prevent_initial_call=True)(callback)
+        return func
+    return decorator
+
+
+def server_chart_callback(*dependencies):
+    # The time charts are only server callbacks when they are not updated in the browser
+    if CLIENTSIDE_CHARTS:
+        return lambda func: func
+    return lazy_chart_callback(*dependencies)
+
+
+def chart_payload(filter_state=None):
+    """
+    Everything the clientside time charts need under the shared filters: their
+    figures with every option selected, the per-operator-type counts of the
+    part-of-day pie and the empty figure.
+    """
+    period_operator = current_snapshot().filtered_aggregates(normalize_filter_state(filter_state))["period_operator"]
+    pie = update_pie_chart(OPERATOR_TYPES, filter_state)
+    period_counts = {
+        operator_type: [
+            int(period_operator.loc[
+                (period_operator["Time_Period"] == period) & (period_operator["Operator_Type"] == operator_type),
+                "Accidents"
+            ].sum())
+            for period in pie["data"][0]["labels"]
+        ]
+        for operator_type in OPERATOR_TYPES
+    }
+    return {
+        "year": crash_over_year(METRIC_OPTIONS, filter_state),
+        "bar": update_bar_chart(OPERATOR_TYPES, filter_state),
+        "pie": pie,
+        "period_counts": period_counts,
+        "metric_colors": METRIC_COLORS,
+        "empty": serialize_figure(empty_figure_message("Please select at least one metric to display.")),
+    }
+
+
+if CLIENTSIDE_CHARTS:
+    # Only a change of the shared filters reaches the server, for a new payload
+    @app.callback(
+        Output('chart-payload', 'data'),
+        Input('filter-state', 'data'),
+        prevent_initial_call=True
+    )
+    def update_chart_payload(filter_state):
+        return chart_payload(filter_state)
+
+    # Checklist toggles cost no server request: the browser re-slices the payload
+    app.clientside_callback(
+        ClientsideFunction(namespace="charts", function_name="crashOverYear"),
+        Output('accident-time-series', 'figure'),
+        Input('metric-selector', 'value'),
+        Input('chart-payload', 'data')
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace="charts", function_name="monthlyBar"),
+        Output("monthly-crash-bar-chart", "figure"),
+        Input("operator-type-selector", "value"),
+        Input('chart-payload', 'data')
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace="charts", function_name="partOfDayPie"),
+        Output("crash-time-pie-chart", "figure"),
+        Input("operator-type-selector", "value"),
+        Input('chart-payload', 'data')
+    )
+
+##############################################################################################################################
+@server_chart_callback(
     Output('accident-time-series', 'figure'),
-    Input('metric-selector', 'value')
+    Input('metric-selector', 'value'),
+    Input('filter-state', 'data')
 )
-def crash_over_year(selected_metrics):
-    # Prepare data: group by year
-    summary_by_year = airplane_data_clean.groupby('Year').agg(
-                    { 'Date': 'count','Fatalities': 'sum'}).reset_index().rename(columns={'Date': 'Accidents'})
+@figure_cache.memoize(normalize=with_filter_state(ordered_subset(METRIC_OPTIONS)))
+def crash_over_year(selected_metrics, filter_state):
+    aggregates = current_snapshot().filtered_aggregates(filter_state)
+    # Prepare data: precomputed counts by year
+    summary_by_year = aggregates["year"]
     if not selected_metrics:
         return empty_figure_message("Please select at least one metric to display.")
     
@@ -833,56 +1241,40 @@ def crash_over_year(selected_metrics):
     fig = px.line(
         summary_by_year,
         x="Year",
-        y=selected_metrics,
+        y=list(selected_metrics),
         labels={"value": "Count", "variable": "Metric"},
-        color_discrete_sequence=["#E97451","#800020" ],
+        color_discrete_sequence=METRIC_COLORS,
         title="Number of accident and Fatalities by Year"  # Custom line colors
     )
    
     fig.update_layout(
-            plot_bgcolor="#0E1117",
-            paper_bgcolor="#0E1117",
-            font_color="white",
-            title_font_size=22,  # Increased title font size
             title_x=0.5,
             xaxis = dict(
                     title="Year",
-                    tickfont=dict(color="gray"),
-                    showline=True,
-                    linecolor='gray',  
-                    gridcolor='#333'),
+                    tickfont=dict(color="gray")),
             yaxis = dict(
                     title="Count",
                     tickfont=dict(color="gray"),
-                    showline=True,
-                    linecolor='gray',     
-                    gridcolor='#333',
                     range=[0, None] )
             )
 
     return fig
 
 ##############################################################################################################################
-@app.callback(
+@server_chart_callback(
     Output("monthly-crash-bar-chart", "figure"),
-    Input("operator-type-selector", "value")
+    Input("operator-type-selector", "value"),
+    Input('filter-state', 'data')
 )
-def update_bar_chart(selected_types):
-    month_order = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
-    airplane_data_clean["Month"] = pd.Categorical(
-        airplane_data_clean["Month"], categories=month_order, ordered=True
-    )
-    # Filter the data
-    filtered_df = airplane_data_clean[airplane_data_clean["Operator_Type"].isin(selected_types)]
-
-    # Group and count crashes per month and operator type
+@figure_cache.memoize(normalize=with_filter_state(ordered_subset(OPERATOR_TYPES)))
+def update_bar_chart(selected_types, filter_state):
+    aggregates = current_snapshot().filtered_aggregates(filter_state)
+    month_order = MONTH_ORDER
+    # Filter the precomputed crash counts per month and operator type
+    month_operator = aggregates["month_operator"]
     monthly_counts = (
-        filtered_df.groupby(["Month", "Operator_Type"])
-        .size()
-        .reset_index(name="Accident_Count")
+        month_operator[month_operator["Operator_Type"].isin(selected_types)]
+        .rename(columns={"Accidents": "Accident_Count"})
     )
 
     if not selected_types:
@@ -907,24 +1299,10 @@ def update_bar_chart(selected_types):
     fig.update_traces(marker_line_width=0)
 
     fig.update_layout(
-        plot_bgcolor="#0E1117",
-        paper_bgcolor="#0E1117",
-        font_color="white",
-        title_font_size=22,  # Increased title font size
         title_x=0.45,
-        xaxis=dict(
-            title="Month",
-            tickfont=dict(color="white"),
-            showline=True,
-            linecolor='gray',
-            gridcolor=None
-        ),
+        xaxis=dict(title="Month"),
         yaxis=dict(
             title="Count",
-            tickfont=dict(color="white"),
-            showline=True,
-            linecolor='gray',
-            gridcolor='#333',
             range=[0, None]
         )
     )
@@ -932,34 +1310,22 @@ def update_bar_chart(selected_types):
     return fig
 
 #############################################################################################################################
-@app.callback(
+@server_chart_callback(
     Output("crash-time-pie-chart", "figure"),
-    Input("operator-type-selector", "value")
+    Input("operator-type-selector", "value"),
+    Input('filter-state', 'data')
 )
-def update_pie_chart(selected_types):
-    # Categorize Time into periods (e.g., night, morning, afternoon, evening)
-    # Handle missing or malformed time values gracefully
-    def get_time_period(time_str):
-        try:
-            hour = int(str(time_str).split(":")[0])
-            if 0 <= hour < 6:
-                return "Night"
-            elif 6 <= hour < 12:
-                return "Morning"
-            elif 12 <= hour < 18:
-                return "Afternoon"
-            elif 18 <= hour < 24:
-                return "Evening"
-        except Exception:
-            return "Unknown"
-        return "Unknown"
-
-    airplane_data_clean['Time_Period'] = airplane_data_clean['Time'].apply(get_time_period)
-
-    # Filter data
-    filtered_data = airplane_data_clean[
-        airplane_data_clean["Operator_Type"].isin(selected_types)
-    ]
+@figure_cache.memoize(normalize=with_filter_state(ordered_subset(OPERATOR_TYPES)))
+def update_pie_chart(selected_types, filter_state):
+    aggregates = current_snapshot().filtered_aggregates(filter_state)
+    # Sum the precomputed crash counts per part of the day over the selected operator types
+    period_operator = aggregates["period_operator"]
+    filtered_data = (
+        period_operator[period_operator["Operator_Type"].isin(selected_types)]
+        .groupby("Time_Period", observed=True, sort=False)["Accidents"]
+        .sum()
+        .reset_index()
+    )
 
     if not selected_types:
         return empty_figure_message("Please select at least one metric to display.")
@@ -968,20 +1334,15 @@ def update_pie_chart(selected_types):
     fig = px.pie(
         filtered_data,
         names="Time_Period",
+        values="Accidents",
         title="Crashes by Part of the Day",
         color_discrete_sequence=px.colors.sequential.RdBu
     )
 
     fig.update_layout(
-        plot_bgcolor="#0E1117",
-        paper_bgcolor="#0E1117",
-        font_color="white",
-        title_font_size=22,
         title_x=0.45,
             legend=dict(
-            font_color="white",
             font=dict(size=16),  
-            bgcolor="rgba(0,0,0,0)",
             orientation="v",
             yanchor="bottom",
             y=0.7,
@@ -1001,40 +1362,50 @@ def update_pie_chart(selected_types):
 ##############################################################################################################################
 @app.callback(
     Output('date-search-result', 'children'),
-    Input('date-picker', 'date')
+    Input('date-picker', 'date'),
+    prevent_initial_call=True
 )
 def display_accidents_per_date(selected_date):
     if not selected_date:
         return html.P("Please select a date to view accident information.", style={"color": "white"})
 
-    df = airplane_data_clean.copy()
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    snap = current_snapshot()
     target_date = pd.to_datetime(selected_date)
 
-    filtered_df = df[df['Date'] == target_date]
+    # Binary search in the date index instead of scanning every row
+    rows = snap.date_index.on(target_date)
 
-    if filtered_df.empty:
+    if len(rows) == 0:
         return html.P(f"No accidents found for {target_date.date()}.", style={"color": "white","fontSize": "20px"})
-    
+
+    # Build the list from the column arrays of the matching rows only
+    found = snap.clean.iloc[rows]
+    records = zip(
+        found['Date'].dt.date.tolist(), found['Country'].tolist(), found['Operator_Type'].tolist(),
+        found['Type'].tolist(), found['Fatalities'].tolist()
+    )
     return html.Div([
         html.P(f"Accidents on {target_date.date()}:", style={"color": "#FF4B4B", "fontWeight": "bold", "fontSize": "21px"}),
         html.Ul([
             html.Li([
                 html.Span(
-                    f"{row['Date'].date()} - {row['Country']} - {row['Operator_Type']} - {row['Type']} - Fatalities: {row['Fatalities']}",
+                    f"{date} - {country} - {operator_type} - {aircraft} - Fatalities: {fatalities}",
                     style={"color": "#FAFAFA", "fontSize": "20px", "marginBottom": "5px"}
                 )
-            ]) for _, row in filtered_df.iterrows()
+            ]) for date, country, operator_type, aircraft, fatalities in records
         ], style={"marginLeft": "20px"})
     ])
 
 ##############################################################################################################################
-@app.callback(
+@lazy_chart_callback(
     Output('world-map', 'figure'),
-    Input('tabs', 'value')
+    State('tabs', 'value'),
+    Input('filter-state', 'data')
 )
-def update_world_map(tab_value):
-    country_counts = airplane_data_clean['Country'].value_counts().reset_index()
+@figure_cache.memoize(normalize=with_filter_state(ignore_inputs))
+def update_world_map(tab_value, filter_state):
+    aggregates = current_snapshot().filtered_aggregates(filter_state)
+    country_counts = aggregates["country"][["Country", "Accidents"]]
     country_counts.columns = ['Country', 'Crash_Count']
 
     # Create choropleth map
@@ -1051,10 +1422,7 @@ def update_world_map(tab_value):
         width=1100,
         height=600,
         geo=dict(bgcolor="#0E1117", projection_type="natural earth"),
-        paper_bgcolor="#0E1117",
-        font_color="white",
         font=dict(size=20),  # Increased font size
-        title_font_size=22,  # Increased title font size
         title_x=0.45         # Center the title
     )
     fig.update_geos(
@@ -1070,43 +1438,217 @@ def update_world_map(tab_value):
     fig.update_traces(marker_line_color='white', marker_line_width=0.3)
     return fig
 #############################################################################################################################
+# The last pan / zoom of the crash map: selections and autosize events carry no view (assets/point_map.js)
+app.clientside_callback(
+    ClientsideFunction(namespace="pointMap", function_name="keepView"),
+    Output('crash-point-map-view', 'data'),
+    Input('crash-point-map', 'relayoutData'),
+    prevent_initial_call=True
+)
+#############################################################################################################################
+@lazy_chart_callback(
+    Output('crash-point-map', 'figure'),
+    Input('crash-point-map-view', 'data'),
+    Input('filter-state', 'data')
+)
+@map_cache.memoize(normalize=with_filter_state(lambda relayout_data: (map_view(relayout_data),)))
+def update_crash_point_map(view, filter_state):
+    # One marker per occupied grid cell of the viewport, or the crashes themselves once few enough (point_map.py)
+    level, bounds = view
+    snap = current_snapshot()
+    latitude, longitude = snap.clean["Latitude"].to_numpy(), snap.clean["Longitude"].to_numpy()
+    # Crashes in view from the spatial index, then those matching the filters
+    rows = snap.geo_index.in_bounds(*bounds)
+    mask = snap.cross_filter.mask(filter_state)
+    if mask is not None:
+        rows = rows[mask[rows]]
+    points, in_view = bin_points(
+        latitude[rows], longitude[rows], snap.clean["Fatalities"].to_numpy()[rows], bounds, cell_size(level)
+    )
+
+    if in_view is None:
+        hover = [f"{crashes:,} crashes<br>{fatalities:,} fatalities"
+                 for crashes, fatalities in zip(points["Crashes"], points["Fatalities"])]
+        size = np.clip(4 + 3 * np.sqrt(points["Crashes"]), 6, 40)
+    else:
+        crashes = snap.clean.iloc[rows[in_view]]
+        hover = [f"{location}<br>{date:%Y-%m-%d} - Fatalities: {fatalities}"
+                 for location, date, fatalities in zip(crashes["Location"], crashes["Date"], crashes["Fatalities"])]
+        size = 8
+
+    fig = go.Figure(go.Scattermap(
+        lat=points["Latitude"], lon=points["Longitude"],
+        mode="markers",
+        marker=dict(size=size, color=points["Crashes"], colorscale="OrRd", cmin=1, opacity=0.8,
+                    showscale=in_view is None, colorbar=dict(title="Crashes")),
+        text=hover, hoverinfo="text",
+    ))
+    fig.update_layout(
+        # Sized by the graph's style, so the map follows the width of the screen
+        autosize=True,
+        title="Crash Locations",
+        font=dict(size=20),
+        title_x=0.45,
+        margin=dict(l=0, r=0, t=60, b=0),
+        # The user's pan and zoom are kept when the figure is replaced
+        uirevision="crash-point-map",
+        map=dict(style="carto-darkmatter", **DEFAULT_VIEW),
+    )
+    return fig
+#############################################################################################################################
+def first_by(keys, n=MAX_LISTED_CRASHES):
+    # Positions of the n smallest keys in order, without sorting the others
+    if len(keys) > n:
+        first = np.argpartition(keys, n)[:n]
+        return first[np.argsort(keys[first], kind="stable")]
+    return np.argsort(keys, kind="stable")
+
+
+def crash_summary(snap, rows, listed_rows, title, distances=None):
+    # Count and fatalities of the given rows of `snap`, and the records of the listed ones (at most MAX_LISTED_CRASHES)
+    total_fatalities = int(snap.clean["Fatalities"].to_numpy()[rows].sum())
+    # Only the listed columns of the listed rows are taken from the frame
+    listed = {column: snap.clean[column].iloc[listed_rows]
+              for column in ("Date", "Location", "Operator", "Fatalities")}
+    labels = [
+        f"{date} - {location} - {operator} - Fatalities: {fatalities}"
+        for date, location, operator, fatalities in zip(
+            listed["Date"].dt.date.tolist(), listed["Location"].tolist(), listed["Operator"].tolist(),
+            listed["Fatalities"].tolist()
+        )
+    ]
+    if distances is not None:
+        labels = [f"{distance:,.0f} km - {label}" for distance, label in zip(distances, labels)]
+    items = [
+        html.Li(html.Span(label, style={"color": "#FAFAFA", "fontSize": "20px", "marginBottom": "5px"}))
+        for label in labels
+    ]
+    if len(rows) > MAX_LISTED_CRASHES:
+        items.append(html.Li(f"... and {len(rows) - MAX_LISTED_CRASHES:,} more", style={"color": "#FAFAFA", "fontSize": "20px"}))
+    return html.Div([
+        html.P(title, style={"color": "#FF4B4B", "fontWeight": "bold", "fontSize": "21px"}),
+        html.P(f"✈️ Total Accidents: {len(rows)}", style={"color": "#FAFAFA", "fontSize": "18px"}),
+        html.P(f"💀 Total Fatalities: {total_fatalities}", style={"color": "#FAFAFA", "fontSize": "18px"}),
+        html.Ul(items, style={"marginLeft": "20px"})
+    ])
+
+
+def matching_filters(snap, rows, filter_state):
+    # Which rows of a spatial query on `snap` match the shared filters (all of them when nothing is filtered)
+    mask = snap.cross_filter.mask(normalize_filter_state(filter_state))
+    return np.ones(len(rows), dtype=bool) if mask is None else mask[rows]
+
+
+@app.callback(
+    Output('map-selection-result', 'children'),
+    Input('crash-point-map', 'selectedData'),
+    Input('filter-state', 'data'),
+    prevent_initial_call=True
+)
+def crashes_in_selection(selected_data, filter_state):
+    # Box and lasso selections on the crash map, answered from the spatial index
+    selected_data = selected_data or {}
+    # Row positions are only valid in the snapshot they come from: one snapshot for the whole request
+    snap = current_snapshot()
+    geo_index = snap.geo_index
+    box = (selected_data.get("range") or {}).get("map")
+    lasso = (selected_data.get("lassoPoints") or {}).get("map")
+    if box:
+        (west, north), (east, south) = box
+        west, east = min(west, east), max(west, east)
+        if east - west < 360:
+            west, east = wrap_longitude(west), wrap_longitude(east)
+        else:
+            west, east = -180.0, 180.0
+        rows = geo_index.in_bounds(west, min(south, north), east, max(south, north))
+    elif lasso:
+        rows = geo_index.in_polygon([(wrap_longitude(lon), lat) for lon, lat in lasso])
+    else:
+        return html.P("Select an area on the map to list its crashes.", style={"color": "#FAFAFA", "fontSize": "19px"})
+
+    rows = rows[matching_filters(snap, rows, filter_state)]
+    # Most recent first
+    dates = snap.clean["Date"].to_numpy()[rows].astype(np.int64)
+    return crash_summary(snap, rows, rows[first_by(-dates)], "Crashes in the selected area:")
+
+#############################################################################################################################
+@app.callback(
+    Output('radius-search-result', 'children'),
+    Input('radius-center', 'value'),
+    Input('radius-km', 'value'),
+    Input('filter-state', 'data'),
+    prevent_initial_call=True
+)
+def search_near_place(place, radius_km, filter_state):
+    if not place:
+        return html.Div("Please enter a place name or coordinates.", style={"color": "#FAFAFA", "fontSize": "19px"})
+    if not radius_km or not 1 <= radius_km <= MAX_RADIUS_KM:
+        return html.Div(f"The radius must be between 1 and {MAX_RADIUS_KM:,} km.", style={"color": "#FF4B4B"})
+
+    snap = current_snapshot()
+    center = snap.geocoder.locate(place)
+    if center is None:
+        return html.Div(f"Could not place '{place}'.", style={"color": "#FF4B4B"})
+
+    # Bounding box of the circle from the spatial index, then exact distances to its crashes only
+    rows, distances = snap.geo_index.within(*center, radius_km)
+    keep = matching_filters(snap, rows, filter_state)
+    rows, distances = rows[keep], distances[keep]
+    # Nearest first
+    nearest = first_by(distances)
+    return crash_summary(
+        snap, rows, rows[nearest], f"Crashes within {radius_km:,} km of {place} ({center[0]:.2f}, {center[1]:.2f}):",
+        distances[nearest]
+    )
+
+#############################################################################################################################
 @app.callback(
     Output("country-search-result", "children"),
-    Input("country-input", "value")
+    Input("country-input", "value"),
+    prevent_initial_call=True
 )
 def search_by_country(country_name):
     if not country_name:
         return html.Div("Please enter a country name.", style={"color": "#FAFAFA", "fontSize": "19px"})
 
-    # Normalize input for comparison
-    country = country_name.strip().lower()
-    
-    # Filter and check matches
-    filtered_df = airplane_data_clean[airplane_data_clean["Country"].str.lower() == country]
-    
-    if filtered_df.empty:
+    # Dict hit on the normalized name (case and surrounding spaces ignored)
+    entry = current_snapshot().country_index.get(country_name)
+
+    if entry is None:
         return html.Div(f"No records found for '{country_name}'.", style={"color": "#FF4B4B"})
-    
-    num_accidents = len(filtered_df)
-    total_fatalities = filtered_df["Fatalities"].sum()
+
+    num_accidents = entry["accidents"]
+    total_fatalities = entry["fatalities"]
 
     return html.Div([
         html.P(f"✈️ Total Accidents: {num_accidents}", style={"color": "#FAFAFA", "fontSize": "18px"}),
         html.P(f"💀 Total Fatalities: {total_fatalities}", style={"color": "#FAFAFA", "fontSize": "18px"}),
     ])
 
-############################################################################################################################
+#############################################################################################################################
 @app.callback(
+    Output("country-suggestions", "children"),
+    Input("country-input", "value"),
+    prevent_initial_call=True
+)
+def suggest_countries(country_name):
+    # Autocomplete: country names starting with what has been typed so far
+    suggestions = current_snapshot().country_index.suggest(country_name or "")
+    return [html.Option(value=name) for name in suggestions]
+
+############################################################################################################################
+@lazy_chart_callback(
     Output("top-countries-bar-chart", "figure"),
-    Input("top-countries-bar-chart", "id") ) 
-def update_top_countries_bar_chart(dummy_input):
+    Input("top-countries-bar-chart", "id"),
+    Input('filter-state', 'data') ) 
+@figure_cache.memoize(normalize=with_filter_state(ignore_inputs))
+def update_top_countries_bar_chart(dummy_input, filter_state):
+    aggregates = current_snapshot().filtered_aggregates(filter_state)
     # For now, we're not filtering by the country_value, just showing top 10
     top_countries = (
-        airplane_data_clean["Country"]
-        .value_counts()
-        .nlargest(10)
-        .rename_axis("Country")
-        .reset_index(name="Crash_Count")
+        aggregates["country"]
+        .nlargest(10, "Accidents")
+        .rename(columns={"Accidents": "Crash_Count"})
     )
     
     fig = px.bar(
@@ -1114,27 +1656,13 @@ def update_top_countries_bar_chart(dummy_input):
         x="Country",
         y="Crash_Count",
         title="Top 10 Countries by Number of Airplane Crashes",
-        color_discrete_sequence=["#800020"],
-        template="plotly_dark" 
+        color_discrete_sequence=["#800020"]
     )
     
     fig.update_layout(
-        plot_bgcolor="#0E1117",
-        paper_bgcolor="#0E1117",
-        font_color="white",
-        title_font_size=22,  # Increased title font size
         title_x=0.45,
-        xaxis=dict(
-            tickfont=dict(color="white"),
-            showline=True,
-            linecolor='gray'
-        ),
         yaxis=dict(
             title="Count",
-            tickfont=dict(color="white"),
-            showline=True,
-            linecolor='gray',
-            gridcolor='#333',
             range=[0, None]
         )
     )
@@ -1143,13 +1671,16 @@ def update_top_countries_bar_chart(dummy_input):
     return fig
 
 ##############################################################################################################################
-@app.callback(
+@lazy_chart_callback(
     Output("cause-pie-chart", "figure"),
-    Input("tabs", "value")
+    State("tabs", "value"),
+    Input('filter-state', 'data')
 )
-def update_cause_pie_chart(_):
+@figure_cache.memoize(normalize=with_filter_state(ignore_inputs))
+def update_cause_pie_chart(_, filter_state):
+    aggregates = current_snapshot().filtered_aggregates(filter_state)
     # Get cause counts
-    cause_counts = airplane_data_clean['Causes'].value_counts().reset_index()
+    cause_counts = aggregates["cause"][["Causes", "Accidents"]]
     cause_counts.columns = ['Cause', 'Count']
     
     # Calculate percentages
@@ -1180,17 +1711,10 @@ def update_cause_pie_chart(_):
         height=700,
         width=1100,
         margin=dict(t=80, b=10, l=200, r=200),
-        paper_bgcolor='#0E1117',
-        plot_bgcolor='#0E1117',
-        font_color="white",
-        title_font_color="white",
-        title_font_size=22,  # Increased title font size
         title_x=0.5,
         showlegend=True,
         legend=dict(
-            font_color="white",
             font=dict(size=17),  # Updated legend font size
-            bgcolor="rgba(0,0,0,0)",
             orientation="v",
             yanchor="bottom",
             y=0.3,
@@ -1203,23 +1727,104 @@ def update_cause_pie_chart(_):
 ############################################################################################################################"
 @app.callback(
     Output("cause-stats", "children"),
-    Input("cause-dropdown", "value")
+    Input("cause-dropdown", "value"),
+    prevent_initial_call=True
 )
 def update_cause_stats(selected_cause):
-    filtered = airplane_data_clean[airplane_data_clean['Causes'] == selected_cause]
-    crash_count = len(filtered)
-    fatality_sum = filtered['Fatalities'].sum()
+    # Precomputed per-cause statistics, no scan of the raw rows
+    stats = current_snapshot().cause_index.get(selected_cause)
+    if stats is None:
+        return html.Div([
+            html.P("🛩️ Number of Crashes: 0", style={"marginBottom": "10px","fontSize": "20px"}),
+            html.P("☠️ Total Fatalities: 0", style={"marginBottom": "10px","fontSize": "20px"}),
+            html.P("No fatality data.")
+        ])
+
+    by_decade = " · ".join(f"{decade}s: {count}" for decade, count in stats["by_decade"].items())
+    by_operator_type = " · ".join(f"{operator_type}: {count}" for operator_type, count in stats["by_operator_type"].items())
 
     return html.Div([
-        html.P(f"🛩️ Number of Crashes: {crash_count}", style={"marginBottom": "10px","fontSize": "20px"}),
-        html.P(f"☠️ Total Fatalities: {fatality_sum}", style={"marginBottom": "10px","fontSize": "20px"}),
-        html.P(f"📊 Fatality Rate: {fatality_sum / crash_count:.2f} per crash" if crash_count > 0 else "No fatality data.")
+        html.P(f"🛩️ Number of Crashes: {stats['crashes']}", style={"marginBottom": "10px","fontSize": "20px"}),
+        html.P(f"☠️ Total Fatalities: {stats['fatalities']}", style={"marginBottom": "10px","fontSize": "20px"}),
+        html.P(f"📊 Fatality Rate: {stats['fatality_rate']:.2f} per crash", style={"marginBottom": "10px"}),
+        html.P(f"📅 Years: {stats['first_year']} - {stats['last_year']}", style={"marginBottom": "10px"}),
+        html.P(f"🕰️ By Decade: {by_decade}", style={"marginBottom": "10px"}),
+        html.P(f"🧭 By Operator Type: {by_operator_type}")
     ])
 
 #############################################################################################################################
+def wordcloud_filters(causes, decades, operator_types):
+    # Filter values as sorted tuples, so every selection order maps to the same image
+    return (
+        tuple(sorted(causes or [])),
+        tuple(sorted(decades or [])),
+        ordered_subset(OPERATOR_TYPES)(operator_types)[0],
+    )
 
-    
+
+@lazy_chart_callback(
+    Output("wordcloud-image", "src"),
+    Input("wordcloud-cause-filter", "value"),
+    Input("wordcloud-decade-filter", "value"),
+    Input("wordcloud-operator-filter", "value")
+)
+@figure_cache.memoize(normalize=wordcloud_filters)
+def update_wordcloud(causes, decades, operator_types):
+    if not operator_types:
+        return None
+    # Summed token counts of the matching (cause, decade, operator type) cells
+    frequencies = current_snapshot().token_index.frequencies(causes, decades, operator_types)
+    try:
+        return wordcloud_image(frequencies)
+    except ImportError:
+        # Pre-rendered cloud of all summaries when wordcloud is not installed
+        return "/assets/wordcloud_summary.png"
+
+#############################################################################################################################
+def warm_up_figure_cache():
+    # Pre-render every tab layout and every figure of the finite callback input spaces
+    layout_cache.warm_up({render_content: [("tab1",), ("tab2",), ("tab3",)]})
+    return figure_cache.warm_up({
+        # Unfiltered figures only: the filter combinations are rendered on demand
+        crash_over_year: [(metrics, None) for metrics in all_subsets(METRIC_OPTIONS)],
+        update_bar_chart: [(types, None) for types in all_subsets(OPERATOR_TYPES)],
+        update_pie_chart: [(types, None) for types in all_subsets(OPERATOR_TYPES)],
+        update_world_map: [(None, None)],
+        update_top_countries_bar_chart: [(None, None)],
+        update_cause_pie_chart: [(None, None)],
+        update_wordcloud: [(None, None, OPERATOR_TYPES)],
+    })
+
+
+# Optional warm-up so that no user request pays for loading the data or rendering a figure
+STARTUP_TIMINGS["layout"] = time.perf_counter() - _start
+if WARM_FIGURE_CACHE:
+    _start = time.perf_counter()
+    current_snapshot().materialize()
+    warm_up_figure_cache()
+    STARTUP_TIMINGS["warm_up"] = time.perf_counter() - _start
+
+#############################################################################################################################
+# Reload the data when the files in Data/ change (data_watcher.py)
+def reload_snapshot():
+    # Runs in the watcher thread (in the gunicorn master on SIGHUP): the snapshot is complete, lazy
+    # parts included, before it is published
+    publish(DatasetSnapshot(load_raw_data, load_clean_data(), load_raw_metadata()).materialize())
+    if WARM_FIGURE_CACHE:
+        warm_up_figure_cache()
+
+
+data_watcher = DataWatcher(
+    [CLEAN_CSV, CLEAN_STORE, GAZETTEER, RAW_CSV, RAW_STORE, RAW_METADATA], reload_snapshot,
+    interval=float(os.environ.get("DATA_WATCH_INTERVAL", 5))
+)
+metrics.add_metric("dashboard_data_reloads_total", "Data reloads after a change in Data/.", "counter",
+                   lambda: data_watcher.reloads, result="ok")
+metrics.add_metric("dashboard_data_reloads_total", "Data reloads after a change in Data/.", "counter",
+                   lambda: data_watcher.failures, result="failed")
 
 if __name__ == '__main__':
+    if DATA_WATCH:
+        data_watcher.start()
     port = int(os.environ.get("PORT", 10000))
     app.run_server(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
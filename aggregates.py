@@ -0,0 +1,37 @@
+"""
+Aggregate tables shared by the chart callbacks.
+
+Every count and fatality sum the charts need is computed once per version of
+the data, when its snapshot is built (at startup, then in the background after
+each change of the files in Data/, see data_watcher.py). Callbacks only filter
+and sum these small tables, which keeps each request O(number of groups).
+"""
+
+
+def _count_and_sum(df, by, sort_by_count=False):
+    table = (
+        df.groupby(by, observed=True)
+        .agg(Accidents=("Fatalities", "size"), Fatalities=("Fatalities", "sum"))
+        .reset_index()
+    )
+    if sort_by_count:
+        table = table.sort_values("Accidents", ascending=False, kind="stable").reset_index(drop=True)
+    return table
+
+
+def build_aggregates(df):
+    """
+    Build the aggregate layer from the cleaned dataset (with its derived
+    Time_Period column, see snapshot.add_derived_columns).
+
+    Returns a dict of small DataFrames, each with Accidents (crash count) and
+    Fatalities (sum) columns, keyed by year, month x operator type,
+    time period x operator type, country and cause.
+    """
+    return {
+        "year": _count_and_sum(df, "Year"),
+        "month_operator": _count_and_sum(df, ["Month", "Operator_Type"]),
+        "period_operator": _count_and_sum(df, ["Time_Period", "Operator_Type"]),
+        "country": _count_and_sum(df, "Country", sort_by_count=True),
+        "cause": _count_and_sum(df, "Causes", sort_by_count=True),
+    }
@@ -0,0 +1,49 @@
+// Clientside versions of the time charts (CLIENTSIDE_CHARTS=1).
+// The server ships the figures with every option selected and the per-operator-type
+// counts once in the "chart-payload" store; checklist toggles only re-slice them here.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    charts: {
+        crashOverYear: function (selectedMetrics, payload) {
+            if (!payload) {
+                return window.dash_clientside.no_update;
+            }
+            if (!selectedMetrics || selectedMetrics.length === 0) {
+                return payload.empty;
+            }
+            const figure = JSON.parse(JSON.stringify(payload.year));
+            // One trace per metric, colored in selection order like px.line
+            figure.data = figure.data.filter(trace => selectedMetrics.includes(trace.name));
+            figure.data.forEach((trace, i) => {
+                trace.line.color = payload.metric_colors[i % payload.metric_colors.length];
+            });
+            return figure;
+        },
+
+        monthlyBar: function (selectedTypes, payload) {
+            if (!payload) {
+                return window.dash_clientside.no_update;
+            }
+            if (!selectedTypes || selectedTypes.length === 0) {
+                return payload.empty;
+            }
+            const figure = JSON.parse(JSON.stringify(payload.bar));
+            figure.data = figure.data.filter(trace => selectedTypes.includes(trace.name));
+            return figure;
+        },
+
+        partOfDayPie: function (selectedTypes, payload) {
+            if (!payload) {
+                return window.dash_clientside.no_update;
+            }
+            if (!selectedTypes || selectedTypes.length === 0) {
+                return payload.empty;
+            }
+            const figure = JSON.parse(JSON.stringify(payload.pie));
+            // Crash counts per part of the day, summed over the selected operator types
+            figure.data[0].values = figure.data[0].labels.map((_, i) =>
+                selectedTypes.reduce((total, type) => total + ((payload.period_counts[type] || [])[i] || 0), 0)
+            );
+            return figure;
+        }
+    }
+});
@@ -0,0 +1,21 @@
+// Lazy chart loading: the first time a ".lazy-section" (see lazy_section in Dashboard.py)
+// comes near the viewport, its "<id>-visible" store is set, which fires the chart's callback.
+// Sections inside a collapsed element only intersect once it is expanded.
+(function () {
+    const observer = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                window.dash_clientside.set_props(entry.target.dataset.visibleStore, {data: true});
+            }
+        });
+    }, {rootMargin: "200px"});
+
+    // Tab contents are rendered by callbacks: observe every section added to the page
+    new MutationObserver(() => {
+        document.querySelectorAll(".lazy-section:not([data-observed])").forEach(section => {
+            section.dataset.observed = "true";
+            observer.observe(section);
+        });
+    }).observe(document.documentElement, {childList: true, subtree: true});
+})();
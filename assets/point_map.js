@@ -0,0 +1,13 @@
+// Crash point map (see point_map.py): only the relayout events carrying the map view
+// (pan and zoom) reach the "crash-point-map-view" store, so that box and lasso
+// selections or autosize events do not re-bin the map at its initial view.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    pointMap: {
+        keepView: function (relayoutData) {
+            if (!relayoutData || !("map.center" in relayoutData) || !("map.zoom" in relayoutData)) {
+                return window.dash_clientside.no_update;
+            }
+            return relayoutData;
+        }
+    }
+});
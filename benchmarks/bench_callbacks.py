@@ -0,0 +1,205 @@
+"""
+Benchmark the dashboard callbacks on the real dataset and on scaled copies.
+
+The callback functions are imported from Dashboard and called directly with
+representative inputs. For each dataset scale (the cleaned dataset repeated N
+times, published as the current snapshot) every call reports:
+
+    - wall time: median over the repeats, figure cache cleared before each call
+    - peak memory: peak of Python/NumPy allocations during one call (tracemalloc)
+    - size: bytes of the JSON sent to the browser, uncompressed and as sent
+      compressed with gzip (and brotli when installed, see compression.py)
+
+None of the benchmarked callbacks read the raw frame, so it is not scaled.
+Results are written as JSON to benchmarks/results/ (one file per commit) and
+two result files can be compared. Run from the repository root:
+
+    python benchmarks/bench_callbacks.py [--scales 1,10,100,1000] [--repeats 5]
+    python benchmarks/bench_callbacks.py --compare OLD.json NEW.json
+
+The 1000x scale (about 5M rows) needs several GB of memory.
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from plotly.io.json import to_json_plotly
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+import Dashboard  # noqa: E402
+from compression import brotli, compress  # noqa: E402
+from snapshot import DatasetSnapshot, current_snapshot, publish  # noqa: E402
+
+FILTERED = {"years": [1950, 1999], "operator_types": ["Civilian"]}
+
+# callback name -> [(label, inputs)]
+CASES = {
+    "crash_over_year": [
+        ("accidents", (["Accidents"], None)),
+        ("both metrics", (["Accidents", "Fatalities"], None)),
+        ("filtered", (["Accidents", "Fatalities"], FILTERED)),
+    ],
+    "update_bar_chart": [
+        ("both types", (["Civilian", "Military"], None)),
+        ("military", (["Military"], None)),
+        ("filtered", (["Civilian", "Military"], FILTERED)),
+    ],
+    "update_pie_chart": [
+        ("both types", (["Civilian", "Military"], None)),
+        ("filtered", (["Civilian", "Military"], FILTERED)),
+    ],
+    "display_accidents_per_date": [
+        ("one crash", ("2009-06-08",)),
+        ("busy day", ("1972-03-03",)),
+        ("no date", (None,)),
+    ],
+    "update_world_map": [
+        ("all", ("tab2", None)),
+        ("filtered", ("tab2", {"causes": ["Weather"]})),
+    ],
+    "search_by_country": [
+        ("usa", ("usa",)),
+        ("france", (" France ",)),
+        ("unknown", ("nowhere",)),
+    ],
+    "update_top_countries_bar_chart": [
+        ("all", ("top-countries-bar-chart", None)),
+    ],
+    "update_cause_pie_chart": [
+        ("all", ("tab2", None)),
+    ],
+    "update_cause_stats": [
+        ("weather", ("Weather",)),
+        ("none", (None,)),
+    ],
+}
+
+
+def serialized_sizes(output):
+    # Dash serializes callback outputs with Plotly's JSON encoder
+    if hasattr(output, "to_plotly_json"):
+        output = output.to_plotly_json()
+    data = to_json_plotly(output).encode()
+    sizes = {"bytes": len(data), "gzip_bytes": len(compress(data, "gzip")[1])}
+    if brotli is not None:
+        sizes["br_bytes"] = len(compress(data, "br")[1])
+    return sizes
+
+
+def measure(callback, inputs, repeats):
+    timings = []
+    for _ in range(repeats):
+        Dashboard.figure_cache.clear()
+        start = time.perf_counter()
+        output = callback(*inputs)
+        timings.append(time.perf_counter() - start)
+
+    Dashboard.figure_cache.clear()
+    gc.collect()
+    tracemalloc.start()
+    callback(*inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "wall_ms": float(np.median(timings) * 1000),
+        "peak_kib": peak / 1024,
+        **serialized_sizes(output),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(scales, repeats):
+    base = current_snapshot()
+    results = []
+    for scale in scales:
+        clean = base.clean.drop(columns=["Hour", "Time_Period"])
+        if scale > 1:
+            clean = pd.concat([clean] * scale, ignore_index=True)
+        start = time.perf_counter()
+        publish(DatasetSnapshot(base.raw, clean))
+        build_seconds = time.perf_counter() - start
+        del clean
+        gc.collect()
+        rows = len(current_snapshot().clean)
+        print(f"\nx{scale}: {rows:,} rows, snapshot built in {build_seconds:.1f} s")
+        print(f"{'callback':<32}{'inputs':<14}{'wall':>12}{'peak':>14}{'size':>12}{'gzip':>10}")
+
+        for name, cases in CASES.items():
+            callback = getattr(Dashboard, name)
+            for label, inputs in cases:
+                result = measure(callback, inputs, repeats)
+                results.append({"callback": name, "inputs": label, "scale": scale, "rows": rows, **result})
+                print(f"{name:<32}{label:<14}{result['wall_ms']:>9.2f} ms"
+                      f"{result['peak_kib']:>10,.0f} KiB{result['bytes']:>12,}{result['gzip_bytes']:>10,}")
+        publish(base)
+        gc.collect()
+    return results
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = {(r["callback"], r["inputs"], r["scale"]): r for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = json.load(f)["results"]
+    print(f"{'callback':<32}{'inputs':<14}{'scale':>7}{'wall':>12}{'peak':>10}{'size':>10}"
+          f"{'size before':>14}{'sent now':>10}")
+    for result in new:
+        before = old.get((result["callback"], result["inputs"], result["scale"]))
+        if before is None:
+            continue
+        ratios = [
+            result[key] / before[key] if before[key] else float("nan")
+            for key in ("wall_ms", "peak_kib", "bytes")
+        ]
+        # Bytes on the wire: compressed when the result file has the compressed size
+        sent = result.get("br_bytes", result.get("gzip_bytes", result["bytes"]))
+        print(f"{result['callback']:<32}{result['inputs']:<14}{'x' + str(result['scale']):>7}"
+              f"{ratios[0]:>11.2f}x{ratios[1]:>9.2f}x{ratios[2]:>9.2f}x{before['bytes']:>14,}{sent:>10,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard callbacks.")
+    parser.add_argument("--scales", default="1,10,100,1000", help="comma-separated dataset scales")
+    parser.add_argument("--repeats", type=int, default=5, help="timed calls per input")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/callbacks-<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        sys.exit()
+
+    commit = git_commit()
+    results = run([int(scale) for scale in args.scales.split(",")], args.repeats)
+    output = args.output or os.path.join(RESULTS_DIR, f"callbacks-{commit}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "repeats": args.repeats,
+            "results": results,
+        }, f, indent=2)
+    print(f"\n✓ Results written to: {output}")
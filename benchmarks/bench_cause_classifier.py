@@ -0,0 +1,52 @@
+"""
+Rows per second of CauseClassifier against the notebook's extract_cause.
+
+Checks that the first-match causes are identical to the notebook's on the whole
+(scaled) Summary column. Run from the repository root:
+
+    python benchmarks/bench_cause_classifier.py [scale]
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cause_classifier import CAUSE_KEYWORDS, CauseClassifier  # noqa: E402
+
+
+def notebook_extract_cause(summary):
+    # extract_cause from notebook/preprocessing.ipynb
+    summary = str(summary).lower()
+    for cause, keywords in CAUSE_KEYWORDS.items():
+        if any(keyword in summary for keyword in keywords):
+            return cause
+    return 'Unknown'
+
+
+def timed(label, func, summaries, reference=None):
+    start = time.perf_counter()
+    result = func(summaries)
+    rate = len(summaries) / (time.perf_counter() - start)
+    check = ""
+    if reference is not None:
+        check = f"   {int((pd.Series(result).to_numpy() != reference.to_numpy()).sum())} mismatches"
+    print(f"{label:<34}{rate:12,.0f} rows/s{check}")
+    return result
+
+
+if __name__ == "__main__":
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    raw = pd.read_csv(os.path.join(ROOT, "Data", "Airplane_Crashes_and_Fatalities_Since_1908.csv"))
+    # Same imputation as the notebook before cause extraction
+    summaries = pd.concat([raw["Summary"].fillna("No remark")] * scale, ignore_index=True)
+    print(f"{len(summaries):,} summaries\n")
+
+    classifier = CauseClassifier()
+    reference = timed("notebook extract_cause", lambda s: s.apply(notebook_extract_cause), summaries)
+    timed("classify_batch", classifier.classify_batch, summaries, reference)
+    timed("classify (per row)", lambda s: s.map(classifier.classify), summaries, reference)
+    timed("classify_batch_all (with positions)", classifier.classify_batch_all, summaries)
@@ -0,0 +1,77 @@
+"""
+Rows per second of the batch CountryResolver against the notebook's extract_country.
+
+The notebook version (kept below as the reference) is slow, so it only runs on
+a sample; the resolver's output is checked against it on that sample. Run from
+the repository root:
+
+    python benchmarks/bench_country_resolver.py [sample_size]
+"""
+import os
+import re
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from country_resolver import CountryResolver, US_STATE_ABBREVIATIONS, US_STATE_NAMES  # noqa: E402
+
+
+def notebook_extract_country(location_text, country_list):
+    # extract_country from notebook/preprocessing.ipynb
+    from fuzzywuzzy import process
+
+    if pd.isna(location_text):
+        return None
+    location_upper = location_text.upper()
+    for state in US_STATE_NAMES:
+        if state.upper() in location_upper:
+            return 'USA'
+    location_words = re.findall(r"\b[A-Za-z]+\b", location_text)
+    for word in location_words:
+        if word.upper() in US_STATE_ABBREVIATIONS:
+            return 'USA'
+    words = re.findall(r"[A-Za-z]+", location_text)
+    best_match = None
+    best_score = 0
+    for word in words:
+        match, score = process.extractOne(word, country_list)
+        if score > best_score:
+            best_match = match
+            best_score = score
+    if best_score >= 85:
+        return best_match
+    return None
+
+
+def rows_per_second(func, locations):
+    start = time.perf_counter()
+    result = func(locations)
+    return result, len(locations) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    sample_size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    raw = pd.read_csv(os.path.join(ROOT, "Data", "Airplane_Crashes_and_Fatalities_Since_1908.csv"))
+    # Same imputation as the notebook before country extraction
+    locations = raw["Location"].fillna(raw["Location"].mode()[0])
+    sample = locations.sample(sample_size, random_state=0)
+
+    resolver = CountryResolver()
+    reference, ref_rate = rows_per_second(
+        lambda s: s.apply(notebook_extract_country, country_list=resolver.countries), sample
+    )
+    resolved, _ = rows_per_second(CountryResolver().resolve, sample)
+    mismatches = int((resolved.fillna("") != reference.fillna("")).sum())
+    print(f"notebook extract_country  {ref_rate:12,.0f} rows/s   ({sample_size} sampled rows, {mismatches} mismatches)")
+
+    for scale in (1, 10, 100):
+        scaled = pd.concat([locations] * scale, ignore_index=True)
+        _, rate = rows_per_second(CountryResolver().resolve, scaled)
+        print(f"CountryResolver x{scale:<4}     {rate:12,.0f} rows/s   ({len(scaled):,} rows, cold cache)")
@@ -0,0 +1,72 @@
+"""
+Latency of the cross-filtering engine on a scaled dataset.
+
+A synthetic dataset of the requested number of rows is generated with
+synthetic_data.py (seeded). For each filter combination the script reports the mask time
+and the mask + aggregate tables time, and checks the tables against
+build_aggregates on the filtered frame. Run from the repository root:
+
+    python benchmarks/bench_cross_filter.py [rows]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aggregates import build_aggregates  # noqa: E402
+from cross_filter import CrossFilter, normalize_filter_state  # noqa: E402
+from snapshot import add_derived_columns  # noqa: E402
+from synthetic_data import synthetic_frame  # noqa: E402
+
+REPEATS = 20
+
+FILTER_STATES = {
+    "no filter": {},
+    "year range": {"years": [1950, 1979]},
+    "operator type": {"operator_types": ["Civilian"]},
+    "countries": {"countries": ["USA", "Russia", "France", "Brazil"]},
+    "cause + month": {"causes": ["Weather"], "months": ["December", "January", "February"]},
+    "all five": {
+        "years": [1960, 1999], "operator_types": ["Civilian"], "countries": ["USA", "Canada"],
+        "causes": ["Weather", "Pilot Error"], "months": ["March", "July", "August"],
+    },
+}
+
+
+def median_ms(func):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1000
+
+
+def matches_reference(df, cross_filter, state):
+    mask = cross_filter.mask(state)
+    reference = build_aggregates(df if mask is None else df[mask])
+    tables = cross_filter.aggregates(state)
+    return all(tables[name].equals(reference[name]) for name in reference)
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = add_derived_columns(synthetic_frame(n_rows, seed=0))
+
+    start = time.perf_counter()
+    cross_filter = CrossFilter(df)
+    print(f"{n_rows:,} rows, CrossFilter built in {time.perf_counter() - start:.2f} s\n")
+
+    print(f"{'filter':<16}{'rows':>10}{'mask':>12}{'mask + tables':>16}   check")
+    for label, state in FILTER_STATES.items():
+        state = normalize_filter_state(state)
+        mask = cross_filter.mask(state)
+        rows = n_rows if mask is None else int(mask.sum())
+        mask_ms = median_ms(lambda: cross_filter.mask(state))
+        tables_ms = median_ms(lambda: cross_filter.aggregates(state))
+        check = "ok" if matches_reference(df, cross_filter, state) else "MISMATCH"
+        print(f"{label:<16}{rows:>10,}{mask_ms:>9.2f} ms{tables_ms:>13.2f} ms   {check}")
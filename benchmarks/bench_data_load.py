@@ -0,0 +1,68 @@
+"""
+Compare load time and resident memory of the CSV path against the Feather store.
+
+Each loader runs in a fresh interpreter so that timings include the parsing cost
+a gunicorn worker pays on boot. Run from the repository root after building the
+store with `python data_store.py`:
+
+    python benchmarks/bench_data_load.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEATS = 5
+
+# Executed in the child process; prints the load time and the worker's resident memory in KiB
+CHILD = '''
+import json, time
+import pandas as pd
+import data_store
+
+def rss_kib():
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmRSS"))
+
+start = time.perf_counter()
+if {csv!r}:
+    raw = pd.read_csv(data_store.RAW_CSV)
+    clean = pd.read_csv(data_store.CLEAN_CSV)
+else:
+    raw = data_store.load_raw_data()
+    clean = data_store.load_clean_data()
+elapsed = time.perf_counter() - start
+deep = int(raw.memory_usage(deep=True).sum() + clean.memory_usage(deep=True).sum())
+print(json.dumps({{"seconds": elapsed, "rss_kib": rss_kib(), "frame_bytes": deep}}))
+'''
+
+
+def run_once(csv):
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD.format(csv=csv)],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout)
+
+
+def bench(label, csv):
+    runs = [run_once(csv) for _ in range(REPEATS)]
+    best = min(r["seconds"] for r in runs)
+    rss = min(r["rss_kib"] for r in runs)
+    frame = runs[0]["frame_bytes"]
+    print(f"{label:<10} load {best * 1000:8.1f} ms   RSS {rss / 1024:7.1f} MiB   frames {frame / 2**20:7.1f} MiB")
+    return best, rss
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import data_store
+
+    if not (os.path.exists(data_store.CLEAN_STORE) and os.path.exists(data_store.RAW_STORE)):
+        sys.exit("Feather store not found, run `python data_store.py` first.")
+
+    csv_time, csv_rss = bench("CSV", True)
+    store_time, store_rss = bench("Feather", False)
+    print(f"\nSpeed-up: {csv_time / store_time:.1f}x   RSS saved: {(csv_rss - store_rss) / 1024:.1f} MiB")
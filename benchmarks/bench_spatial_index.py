@@ -0,0 +1,96 @@
+"""
+Radius and viewport queries of the spatial index against a brute-force scan.
+
+Two sets of positions of the requested size: the geocoded positions of a
+synthetic dataset generated with synthetic_data.py (seeded; crashes cluster on the
+gazetteer's places, as in the real data), and positions drawn uniformly on the
+sphere. For each query the script reports the GeoIndex time, the time of a scan of
+every position (haversine distances for radius queries, comparisons for boxes)
+and checks that both return the same rows. Run from the repository root:
+
+    python benchmarks/bench_spatial_index.py [rows]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from indexes import GeoIndex, haversine_km  # noqa: E402
+from synthetic_data import synthetic_frame  # noqa: E402
+
+REPEATS = 20
+
+RADIUS_QUERIES = {
+    "JFK, 50 km": (40.64, -73.78, 50),
+    "Heathrow, 50 km": (51.47, -0.45, 50),
+    "Anchorage, 50 km": (61.17, -150.0, 50),
+    "Moscow, 500 km": (55.76, 37.62, 500),
+    "Fiji, 1000 km": (-17.76, 178.0, 1000),
+}
+
+BOX_QUERIES = {
+    "Switzerland": (5.9, 45.8, 10.5, 47.8),
+    "Europe": (-10.0, 35.0, 30.0, 60.0),
+    "Lower 48": (-125.0, 24.0, -66.0, 49.0),
+    "Pacific (wraps)": (150.0, -40.0, -120.0, 40.0),
+    "World": (-180.0, -90.0, 180.0, 90.0),
+}
+
+
+def median_ms(func):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1000
+
+
+def scan_within(latitude, longitude, lat, lon, radius_km):
+    return np.flatnonzero(haversine_km(latitude, longitude, lat, lon) <= radius_km)
+
+
+def scan_in_bounds(latitude, longitude, west, south, east, north):
+    if west <= east:
+        in_longitude = (longitude >= west) & (longitude <= east)
+    else:
+        in_longitude = (longitude >= west) | (longitude <= east)
+    return np.flatnonzero(in_longitude & (latitude >= south) & (latitude <= north))
+
+
+def uniform_positions(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    latitude = np.degrees(np.arcsin(rng.uniform(-1, 1, n_rows)))
+    return latitude.astype(np.float32), rng.uniform(-180, 180, n_rows).astype(np.float32)
+
+
+def report(label, latitude, longitude):
+    start = time.perf_counter()
+    geo_index = GeoIndex(latitude, longitude)
+    print(f"{label}: {len(geo_index):,} positions, GeoIndex built in {time.perf_counter() - start:.2f} s\n")
+
+    print(f"{'query':<20}{'rows':>10}{'index':>12}{'scan':>12}{'speedup':>10}   check")
+    for name, (lat, lon, radius_km) in RADIUS_QUERIES.items():
+        rows, _ = geo_index.within(lat, lon, radius_km)
+        check = "ok" if np.array_equal(rows, scan_within(latitude, longitude, lat, lon, radius_km)) else "MISMATCH"
+        index_ms = median_ms(lambda: geo_index.within(lat, lon, radius_km))
+        scan_ms = median_ms(lambda: scan_within(latitude, longitude, lat, lon, radius_km))
+        print(f"{name:<20}{len(rows):>10,}{index_ms:>9.2f} ms{scan_ms:>9.2f} ms{scan_ms / index_ms:>9.0f}x   {check}")
+    for name, box in BOX_QUERIES.items():
+        rows = geo_index.in_bounds(*box)
+        check = "ok" if np.array_equal(rows, scan_in_bounds(latitude, longitude, *box)) else "MISMATCH"
+        index_ms = median_ms(lambda: geo_index.in_bounds(*box))
+        scan_ms = median_ms(lambda: scan_in_bounds(latitude, longitude, *box))
+        print(f"{name:<20}{len(rows):>10,}{index_ms:>9.2f} ms{scan_ms:>9.2f} ms{scan_ms / index_ms:>9.0f}x   {check}")
+    print()
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = synthetic_frame(n_rows, seed=0)
+    report(f"synthetic dataset, {n_rows:,} rows", df["Latitude"].to_numpy(), df["Longitude"].to_numpy())
+    report(f"uniform positions, {n_rows:,} rows", *uniform_positions(n_rows))
@@ -0,0 +1,119 @@
+"""
+Startup cost of a dashboard worker.
+
+    - cold start: `import Dashboard` in a fresh interpreter, broken down into the
+      phases of Dashboard.STARTUP_TIMINGS (imports, data load, snapshot build,
+      layout and callback definitions)
+    - preloaded fork: the app is imported once, then a worker is forked as
+      gunicorn does with preload_app (gunicorn.conf.py); reports the time from
+      fork to the first served home page and data table page, with and without
+      the snapshot materialized before forking
+
+Run from the repository root, after `python data_store.py` so that the raw
+dataset metadata exists:
+
+    python benchmarks/bench_startup.py
+"""
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEATS = 5
+
+# Executed in the child process; prints the startup phases and the total time in seconds
+COLD_CHILD = '''
+import json, time
+start = time.perf_counter()
+import Dashboard
+total = time.perf_counter() - start
+print(json.dumps({**Dashboard.STARTUP_TIMINGS, "total": total}))
+'''
+
+TABLE_PAGE = {
+    "output": "..raw-data-table.data...raw-data-table.page_count..",
+    "outputs": [{"id": "raw-data-table", "property": "data"}, {"id": "raw-data-table", "property": "page_count"}],
+    "inputs": [
+        {"id": "raw-data-table", "property": "page_current", "value": 1},
+        {"id": "raw-data-table", "property": "page_size", "value": 10},
+        {"id": "raw-data-table", "property": "sort_by", "value": []},
+        {"id": "raw-data-table", "property": "filter_query", "value": ""},
+    ],
+    "changedPropIds": ["raw-data-table.page_current"],
+}
+
+
+def cold_start():
+    runs = []
+    for _ in range(REPEATS):
+        out = subprocess.run([sys.executable, "-c", COLD_CHILD], cwd=ROOT, capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout.splitlines()[-1]))
+    print(f"Cold start (best of {REPEATS})")
+    for phase in ["import", "load", "snapshot", "layout", "total"]:
+        print(f"    {phase:<10}{min(run.get(phase, 0.0) for run in runs) * 1000:8.1f} ms")
+
+
+def first_response(server):
+    # Runs in the forked worker: time to serve the home page, then a data table page
+    client = server.test_client()
+    timings = {}
+    home = client.get("/")
+    timings["home"] = time.perf_counter()
+    table = client.post("/_dash-update-component", json=TABLE_PAGE)
+    timings["table"] = time.perf_counter()
+    assert home.status_code == 200 and table.status_code == 200
+    return timings
+
+
+def forked_start(server, materialize):
+    from snapshot import DatasetSnapshot, current_snapshot, publish
+    from data_store import load_raw_data
+
+    # A fresh snapshot, so that the raw dataset is not already loaded by an earlier run
+    snapshot = current_snapshot()
+    publish(DatasetSnapshot(load_raw_data, snapshot.clean.drop(columns=["Hour", "Time_Period"]), snapshot.raw_metadata))
+    if materialize:
+        current_snapshot().materialize()
+    gc.collect()
+    gc.freeze()
+
+    runs = []
+    for _ in range(REPEATS):
+        read, write = os.pipe()
+        start = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            timings = first_response(server)
+            os.write(write, json.dumps({key: value - start for key, value in timings.items()}).encode())
+            os._exit(0)
+        os.close(write)
+        with os.fdopen(read) as f:
+            runs.append(json.loads(f.read()))
+        os.waitpid(pid, 0)
+    gc.unfreeze()
+
+    label = "materialized" if materialize else "lazy"
+    home = min(run["home"] for run in runs) * 1000
+    table = min(run["table"] for run in runs) * 1000
+    print(f"    {label:<14}home page {home:8.1f} ms   data table page {table:8.1f} ms")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import data_store
+
+    if data_store.load_raw_metadata() is None:
+        sys.exit("Raw dataset metadata not found, run `python data_store.py` first.")
+
+    cold_start()
+
+    import Dashboard
+
+    print(f"\nPreloaded fork to first response (best of {REPEATS})")
+    forked_start(Dashboard.server, materialize=False)
+    forked_start(Dashboard.server, materialize=True)
@@ -0,0 +1,117 @@
+"""
+Memory of N dashboard worker processes reading the cleaned dataset, with the
+Feather store memory-mapped (data_store.load_clean_data) against a private copy
+per process (pandas.read_feather).
+
+Each worker is a separate interpreter, as gunicorn workers without preload_app
+or after a data reload: it loads the dataset, builds the snapshot and reads
+every column. Once all of them are running, each reports from
+/proc/self/smaps_rollup:
+
+    - RSS: resident pages, shared ones included
+    - PSS: resident pages, each shared page divided by the number of processes
+      mapping it; the sum over the workers is their real footprint
+    - private: pages used by this worker only
+
+Run from the repository root. By default the workers read a synthetic dataset
+of --rows rows (synthetic_data.py) written to a temporary store; --rows 0 uses
+Data/cleaned_airplane_crashes.feather:
+
+    python benchmarks/bench_worker_memory.py [--rows 200000] [--workers 1,4,16]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executed in each worker; reports its memory in KiB once told that every worker is loaded
+CHILD = '''
+import json, sys
+import pandas as pd
+import data_store
+from snapshot import DatasetSnapshot
+
+if {mmap!r}:
+    clean = data_store._read_store({path!r})
+else:
+    clean = pd.read_feather({path!r})
+snapshot = DatasetSnapshot(clean.head(0), clean)
+# Read every column, as the callbacks and the data table do
+for column in snapshot.clean.columns:
+    snapshot.clean[column].nunique()
+print("ready", flush=True)
+sys.stdin.readline()
+
+memory = {{}}
+with open("/proc/self/smaps_rollup") as f:
+    # The first line is the address range of the rollup
+    for line in list(f)[1:]:
+        key, value = line.split()[:2]
+        memory[key.rstrip(":")] = int(value)
+print(json.dumps({{
+    "rss_kib": memory["Rss"],
+    "pss_kib": memory["Pss"],
+    "private_kib": memory["Private_Clean"] + memory["Private_Dirty"],
+}}), flush=True)
+'''
+
+
+def run_workers(n_workers, path, mmap):
+    code = CHILD.format(mmap=mmap, path=path)
+    workers = [
+        subprocess.Popen([sys.executable, "-c", code], cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(n_workers)
+    ]
+    # Measure only once every worker holds its data
+    for worker in workers:
+        if worker.stdout.readline().strip() != "ready":
+            raise RuntimeError("worker failed to load the dataset")
+    results = []
+    for worker in workers:
+        worker.stdin.write("measure\n")
+        worker.stdin.flush()
+        results.append(json.loads(worker.stdout.readline()))
+    for worker in workers:
+        worker.stdin.close()
+        worker.wait()
+    return results
+
+
+def bench(path, worker_counts):
+    print(f"{'store':<8}{'workers':>8}{'RSS/worker':>14}{'PSS/worker':>14}{'private/worker':>16}{'total PSS':>12}")
+    for label, mmap in [("copy", False), ("mmap", True)]:
+        for n_workers in worker_counts:
+            results = run_workers(n_workers, path, mmap)
+            mean = {key: sum(r[key] for r in results) / len(results) / 1024 for key in results[0]}
+            total = sum(r["pss_kib"] for r in results) / 1024
+            print(f"{label:<8}{n_workers:>8}{mean['rss_kib']:>10.1f} MiB{mean['pss_kib']:>10.1f} MiB"
+                  f"{mean['private_kib']:>12.1f} MiB{total:>8.0f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-worker memory with a memory-mapped or copied dataset.")
+    parser.add_argument("--rows", type=int, default=200_000, help="synthetic rows (0: the real dataset)")
+    parser.add_argument("--workers", default="1,4,16", help="comma-separated worker counts")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import data_store
+
+    worker_counts = [int(n) for n in args.workers.split(",")]
+    if args.rows == 0:
+        if not os.path.exists(data_store.CLEAN_STORE):
+            sys.exit("Feather store not found, run `python data_store.py` first.")
+        bench(os.path.abspath(data_store.CLEAN_STORE), worker_counts)
+    else:
+        from synthetic_data import synthetic_frame
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, f"synthetic_{args.rows}.feather")
+            data_store._write_store(synthetic_frame(args.rows), path)
+            print(f"{args.rows:,} synthetic rows, store {os.path.getsize(path) / 2**20:.0f} MiB\n")
+            bench(path, worker_counts)
@@ -0,0 +1,29 @@
+from wordcloud import WordCloud
+import pandas as pd
+import os
+
+# Stopwords come from Data/stopwords_english.txt, as in the dashboard
+from token_index import TokenIndex, WORDCLOUD_OPTIONS
+
+# Create assets directory
+os.makedirs("assets", exist_ok=True)
+
+# Load your data
+airplane_data_clean = pd.read_csv("Data/cleaned_airplane_crashes.csv")
+
+# Token counts of every summary (same index the dashboard uses for its filtered clouds)
+token_index = TokenIndex.from_frame(airplane_data_clean)
+
+# Generate word cloud
+wordcloud = WordCloud(**WORDCLOUD_OPTIONS).generate_from_frequencies(token_index.frequencies())
+
+# Save the word cloud
+output_path = "assets/wordcloud_summary.png"
+wordcloud.to_file(output_path)
+print(f"✓ Word cloud saved to: {output_path}")
+
+# Display word frequencies
+word_freq = wordcloud.words_
+print("\nTop 15 words in your word cloud:")
+for i, (word, freq) in enumerate(sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:10], 1):
+    print(f"{i:2d}. {word}: {freq:.4f}")
@@ -0,0 +1,124 @@
+"""
+Keyword-based crash cause classifier.
+
+Reproduces `extract_cause` from notebook/preprocessing.ipynb: a summary gets
+the first cause, in CAUSE_KEYWORDS order, with a keyword occurring in the
+lower-cased text, or 'Unknown'. The keyword table is compiled once:
+
+    - `classify` tests the keywords of one summary in priority order and
+      stops at the first hit
+    - one regex, one group per cause, scans a summary a single time and
+      reports every matching cause with its keyword and position
+    - `classify_batch` runs over a whole Summary column; with pyarrow each
+      cause's keywords become one RE2 alternation evaluated over the column
+      (rows leave as soon as they are classified), otherwise each summary is
+      scanned once with the compiled regex
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+UNKNOWN = "Unknown"
+
+# Cause categories with their keywords, in priority order
+CAUSE_KEYWORDS = {
+    'Pilot Error': ['pilot', 'altitude', 'approach', 'landing', 'takeoff'],
+    'Mechanical Failure': ['engine', 'failure', 'control', 'mechanical'],
+    'Weather': ['weather', 'storm', 'conditions', 'lightning', 'turbulence'],
+    'Collision/Impact': ['crashed', 'struck', 'mountain', 'obstacle', 'building'],
+    'Fire/Explosion': ['fire', 'explosion', 'burned'],
+    'Runway Issues': ['runway', 'overshot', 'undershot', 'airport'],
+    'Crew Error': ['crew', 'fatigue', 'miscommunication', 'mistake', 'error'],
+    'Hijacking/Terrorism': ['hijack', 'bomb', 'terrorist', 'explosive', 'attack'],
+    'Military Action': ['shot', 'missile', 'military', 'combat', 'war'],
+    'Maintenance Issues': ['maintenance', 'inspected', 'repair', 'servicing'],
+    'Bird Strike': ['bird', 'flock', 'ingested'],
+    'Sabotage': ['sabotage', 'intentional', 'deliberate']
+}
+
+
+def _alternation(keywords):
+    return "|".join(re.escape(keyword) for keyword in keywords)
+
+
+class CauseClassifier:
+    def __init__(self, cause_keywords=CAUSE_KEYWORDS):
+        self.causes = list(cause_keywords)
+        self.keywords = {cause: list(keywords) for cause, keywords in cause_keywords.items()}
+        self._cause_patterns = [_alternation(keywords) for keywords in cause_keywords.values()]
+        self._cause_keywords = [(cause, tuple(keywords)) for cause, keywords in cause_keywords.items()]
+        # A lookahead finds keywords starting at every position, so overlapping keywords
+        # ("error" inside "terrorist") are not hidden by an earlier match. At one position
+        # the groups are tried in priority order.
+        self._pattern = re.compile("(?=" + "|".join(
+            f"(?P<c{i}>{pattern})" for i, pattern in enumerate(self._cause_patterns)
+        ) + ")")
+        # Keywords that can start at the same position as another one (one is a prefix of the other)
+        keyword_causes = [(keyword, i) for i, keywords in enumerate(cause_keywords.values()) for keyword in keywords]
+        self._same_start = {
+            keyword: [(other, j) for other, j in keyword_causes if other != keyword and
+                      (other.startswith(keyword) or keyword.startswith(other))]
+            for keyword, _ in keyword_causes
+        }
+
+    def classify(self, summary):
+        """
+        First matching cause of one summary (same result as the notebook's extract_cause).
+        """
+        # Plain substring tests in priority order stop at the first hit, where the
+        # combined regex would scan every position of the text
+        text = str(summary).lower()
+        for cause, keywords in self._cause_keywords:
+            for keyword in keywords:
+                if keyword in text:
+                    return cause
+        return UNKNOWN
+
+    def classify_all(self, summary):
+        """
+        Every keyword occurrence in one summary as (cause, keyword, position), in
+        text order. The first-match cause is the one with the highest priority.
+        """
+        text = str(summary).lower()
+        matches = []
+        for match in self._pattern.finditer(text):
+            keyword = match.group(match.lastgroup)
+            position = match.start()
+            matches.append((self.causes[int(match.lastgroup[1:])], keyword, position))
+            for other, j in self._same_start[keyword]:
+                if text.startswith(other, position):
+                    matches.append((self.causes[j], other, position))
+        return matches
+
+    def classify_batch(self, summaries):
+        """
+        First matching cause of every summary, as a Series aligned with the input.
+        """
+        summaries = pd.Series(summaries)
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:
+            return summaries.map(self.classify).astype(object)
+
+        text = pc.utf8_lower(pa.array([str(summary) for summary in summaries], type=pa.string()))
+        result = np.full(len(text), len(self.causes))
+        pending = np.arange(len(text))
+        for i, pattern in enumerate(self._cause_patterns):
+            if len(pending) == 0:
+                break
+            # Only the rows without a cause yet are scanned for the next one
+            candidates = text if len(pending) == len(text) else text.take(pa.array(pending))
+            hit = pc.match_substring_regex(candidates, pattern).to_numpy(zero_copy_only=False)
+            result[pending[hit]] = i
+            pending = pending[~hit]
+        labels = np.array(self.causes + [UNKNOWN], dtype=object)
+        return pd.Series(labels[result], index=summaries.index, dtype=object)
+
+    def classify_batch_all(self, summaries):
+        """
+        classify_all over a whole column: a Series of match lists.
+        """
+        summaries = pd.Series(summaries)
+        return summaries.map(self.classify_all)
@@ -0,0 +1,76 @@
+"""
+Compression of the callback responses.
+
+`compress_callbacks(app)` compresses the JSON returned by Dash's
+_dash-update-component endpoint with brotli (when the `brotli` package is
+installed and the browser accepts it) or gzip. Figures are repetitive JSON and
+shrink several times; small responses are sent as they are.
+"""
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CALLBACK_ENDPOINT = "_dash-update-component"
+# Smaller responses are not worth the compression time
+MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def accepted_encodings(accept_encoding):
+    # Encodings with a non-zero q-value ("gzip;q=0" refuses gzip); a malformed q-value refuses too
+    encodings = set()
+    for item in (accept_encoding or "").split(","):
+        encoding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            encodings.add(encoding.strip().lower())
+    return encodings
+
+
+def compress(data, accept_encoding):
+    """
+    (content encoding, body) of a response for the client's Accept-Encoding header;
+    the encoding is None when the data is sent as it is.
+    """
+    if len(data) < MIN_SIZE:
+        return None, data
+    encodings = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in encodings:
+        return "br", brotli.compress(data, quality=BROTLI_QUALITY)
+    if "gzip" in encodings:
+        return "gzip", gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    return None, data
+
+
+def compress_callbacks(app):
+    """
+    Compress the callback responses of a Dash app. Registered after `metrics.instrument`,
+    it runs first, so the metrics record the compressed sizes.
+    """
+    @app.server.after_request
+    def compress_response(response):
+        if (
+            not request.path.endswith(CALLBACK_ENDPOINT)
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+        encoding, body = compress(response.get_data(), request.headers.get("Accept-Encoding"))
+        response.vary.add("Accept-Encoding")
+        if encoding is not None:
+            response.set_data(body)
+            response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,152 @@
+"""
+Batch resolver from free-text Location strings to country names.
+
+Reproduces `extract_country` from notebook/preprocessing.ipynb (US states and
+state abbreviations -> 'USA', otherwise the best fuzzy match of any word against
+the pycountry names, kept when its score is at least 85) but works on a whole
+column at once:
+
+    - duplicate Location strings and repeated words are resolved only once and memoized
+    - state names and abbreviations are found in a single regex pass
+    - words equal to a country name (or to a given alias) skip fuzzy scoring
+    - the remaining words are scored in one vectorized batch with rapidfuzz,
+      falling back to fuzzywuzzy (one word at a time) when rapidfuzz is missing
+
+Requires pycountry.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+MATCH_THRESHOLD = 85
+
+US_STATE_NAMES = [
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware",
+    "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky", "Louisiana",
+    "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi", "Missouri", "Montana", "Nebraska",
+    "Nevada", "New Hampshire", "New Jersey", "New Mexico", "New York", "North Carolina", "North Dakota", "Ohio",
+    "Oklahoma", "Oregon", "Pennsylvania", "Rhode Island", "South Carolina", "South Dakota", "Tennessee",
+    "Texas", "Utah", "Vermont", "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming"
+]
+US_STATE_ABBREVIATIONS = [
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS", "KY",
+    "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND",
+    "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
+]
+
+# One pass over the upper-cased location: any state name as a substring,
+# or a state abbreviation as a whole word
+US_STATE_PATTERN = re.compile(
+    "|".join(re.escape(name.upper()) for name in sorted(US_STATE_NAMES, key=len, reverse=True))
+    + r"|\b(?:" + "|".join(US_STATE_ABBREVIATIONS) + r")\b"
+)
+WORD_PATTERN = re.compile(r"[A-Za-z]+")
+
+
+def _process(text):
+    """
+    The normalization fuzzywuzzy's extractOne + WRatio applies to both strings:
+    non-alphanumerics to spaces, lower case, then non-ASCII characters dropped
+    (so "Réunion" is compared as "runion").
+    """
+    text = re.sub(r"(?ui)\W", " ", text).lower().strip()
+    text = text.encode("ascii", "ignore").decode()
+    return re.sub(r"(?ui)\W", " ", text).strip()
+
+
+def _fuzzy_scores(words, countries):
+    """
+    Best (country position, score) for each word, scored with WRatio against every
+    country. Scores are rounded to integers and ties go to the first country,
+    as with fuzzywuzzy.process.extractOne.
+    """
+    try:
+        from rapidfuzz import fuzz, process
+    except ImportError:
+        from fuzzywuzzy import process as fw_process
+        positions = {country: i for i, country in enumerate(countries)}
+        best = [fw_process.extractOne(word, countries) for word in words]
+        return [(positions[match], score) for match, score in best]
+
+    scores = process.cdist(
+        [_process(word) for word in words], [_process(country) for country in countries],
+        scorer=fuzz.WRatio, workers=-1
+    )
+    scores = np.round(scores)
+    best = scores.argmax(axis=1)
+    return list(zip(best.tolist(), scores[np.arange(len(words)), best].astype(int).tolist()))
+
+
+class CountryResolver:
+    def __init__(self, countries=None, aliases=None, threshold=MATCH_THRESHOLD):
+        """
+        `countries` defaults to the pycountry names. `aliases` optionally maps extra
+        words (e.g. "Burma") to a country name; they are matched with score 100.
+        """
+        if countries is None:
+            import pycountry
+            countries = [country.name for country in pycountry.countries]
+        self.countries = list(countries)
+        self.threshold = threshold
+        # Exact hits: a word equal to a country name scores 100 and nothing else can
+        self._exact = {}
+        for position, country in enumerate(self.countries):
+            self._exact.setdefault(_process(country), (position, 100))
+        for alias, country in (aliases or {}).items():
+            self._exact[_process(alias)] = (self.countries.index(country), 100)
+        self._word_scores = {}
+        self._locations = {}
+
+    def _score_words(self, words):
+        todo = []
+        for word in words:
+            if word in self._word_scores:
+                continue
+            hit = self._exact.get(_process(word))
+            if hit is not None:
+                self._word_scores[word] = hit
+            else:
+                todo.append(word)
+        if todo:
+            self._word_scores.update(zip(todo, _fuzzy_scores(todo, self.countries)))
+
+    def _best_country(self, words):
+        best_match, best_score = None, 0
+        for word in words:
+            position, score = self._word_scores[word]
+            if score > best_score:
+                best_match, best_score = self.countries[position], score
+        return best_match if best_score >= self.threshold else None
+
+    def resolve(self, locations):
+        """
+        Resolve a sequence of Location strings; returns a Series of country names
+        (None when nothing matches) aligned with the input.
+        """
+        locations = pd.Series(locations)
+        new = [
+            location for location in pd.unique(locations.dropna())
+            if location not in self._locations
+        ]
+        words = {}
+        for location in new:
+            if US_STATE_PATTERN.search(location.upper()):
+                self._locations[location] = "USA"
+            else:
+                words[location] = WORD_PATTERN.findall(location)
+
+        self._score_words({word for location_words in words.values() for word in location_words})
+        for location, location_words in words.items():
+            self._locations[location] = self._best_country(location_words)
+
+        return pd.Series(
+            [self._locations.get(location) for location in locations],
+            index=locations.index, dtype=object
+        )
+
+    def __call__(self, location_text):
+        # Drop-in replacement for the notebook's extract_country
+        if pd.isna(location_text):
+            return None
+        return self.resolve([location_text]).iloc[0]
@@ -0,0 +1,207 @@
+"""
+Cross-filtering engine shared by the dashboard charts.
+
+The filter state (year range, operator types, countries, causes, months) is
+turned into a row mask with a few vectorized operations on bitmaps precomputed
+per snapshot:
+
+    - one packed bitmap per value of each categorical column; the selected
+      values of a column are OR-ed, the columns AND-ed
+    - cumulative bitmaps per year (rows up to that year), so any year range is
+      one AND NOT
+
+The charts' aggregate tables are then recomputed from the matching rows, in
+the same shape as aggregates.build_aggregates: the rows are counted into two
+small dense cubes (month x operator type x part of the day x cause, and year x
+country) with one bincount each, and every table is a sum of one cube along
+its other axes.
+"""
+import numpy as np
+import pandas as pd
+
+# Filter state key -> cleaned dataset column
+FILTER_COLUMNS = {
+    "operator_types": "Operator_Type",
+    "countries": "Country",
+    "causes": "Causes",
+    "months": "Month",
+}
+
+# Columns of the dense count cubes; every grouping is within one cube
+CUBES = [
+    ["Month", "Operator_Type", "Time_Period", "Causes"],
+    ["Year", "Country"],
+]
+
+# Aggregate table -> (grouping columns, sorted by crash count), as in build_aggregates
+GROUPINGS = {
+    "year": (["Year"], False),
+    "month_operator": (["Month", "Operator_Type"], False),
+    "period_operator": (["Time_Period", "Operator_Type"], False),
+    "country": (["Country"], True),
+    "cause": (["Causes"], True),
+}
+
+
+def normalize_filter_state(filter_state):
+    """
+    Hashable form of a filter state dict: a tuple of (key, value) pairs of the
+    active filters only, () when nothing is filtered.
+    """
+    filter_state = filter_state or {}
+    normalized = []
+    years = filter_state.get("years")
+    if years:
+        normalized.append(("years", (int(years[0]), int(years[1]))))
+    for key in FILTER_COLUMNS:
+        values = filter_state.get(key)
+        if values:
+            normalized.append((key, tuple(sorted(values))))
+    return tuple(normalized)
+
+
+def _pack(mask):
+    # Boolean mask -> bitmap of uint64 words
+    packed = np.packbits(mask)
+    return np.pad(packed, (0, -len(packed) % 8)).view(np.uint64)
+
+
+def _group_codes(column):
+    """
+    Integer codes and key values of one grouping column, missing values coded -1.
+    Categorical columns keep their category order, others are sorted.
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy(), column.cat.categories, column.dtype
+    codes, uniques = pd.factorize(column, sort=True)
+    return codes, uniques, column.dtype
+
+
+class CrossFilter:
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        for key, column in FILTER_COLUMNS.items():
+            codes, values, _ = _group_codes(df[column])
+            self.bitmaps[key] = {
+                value: _pack(codes == code) for code, value in enumerate(values.tolist())
+            }
+
+        # Rows with a year up to each year, for year ranges
+        years = df["Year"].to_numpy()
+        self.years = np.unique(years)
+        order = np.argsort(years, kind="stable")
+        bounds = np.searchsorted(years[order], self.years, side="right")
+        self._year_bitmaps = []
+        for bound in bounds:
+            rows = np.zeros(self.n_rows, dtype=bool)
+            rows[order[:bound]] = True
+            self._year_bitmaps.append(_pack(rows))
+
+        # Float weights: bincount converts integer weights on every call
+        self.fatalities = df["Fatalities"].to_numpy(dtype=np.float64)
+        self._fatalities_dtype = df["Fatalities"].dtype
+
+        # Per grouping column: row codes with missing values in a trailing slot, key values, dtype
+        self._keys = {}
+        for column in {column for by, _ in GROUPINGS.values() for column in by}:
+            codes, values, dtype = _group_codes(df[column])
+            # bincount works on intp codes, other integer types would be converted on every query
+            self._keys[column] = (np.where(codes < 0, len(values), codes).astype(np.intp), values, dtype)
+        self._cubes = []
+        for columns in CUBES:
+            shape = tuple(len(self._keys[column][1]) + 1 for column in columns)
+            codes = np.ravel_multi_index([self._keys[column][0] for column in columns], shape)
+            # Unfiltered counts and sums, to compute large selections from their complement
+            totals = self._bincounts(codes, int(np.prod(shape)), None, self.fatalities)
+            self._cubes.append((columns, shape, codes, totals))
+
+    def _year_range(self, start, end):
+        # Rows up to `end` minus rows up to the year before `start`
+        hi = np.searchsorted(self.years, end, side="right") - 1
+        lo = np.searchsorted(self.years, start, side="left") - 1
+        if hi < 0:
+            return np.zeros_like(self._year_bitmaps[0])
+        if lo < 0:
+            return self._year_bitmaps[hi]
+        return self._year_bitmaps[hi] & ~self._year_bitmaps[lo]
+
+    def mask(self, filter_state):
+        """
+        Boolean row mask of a normalized filter state, None when nothing is filtered.
+        """
+        words = None
+        for key, value in filter_state:
+            if key == "years":
+                selected = self._year_range(*value)
+            else:
+                bitmaps = self.bitmaps[key]
+                selected = np.zeros_like(self._year_bitmaps[0])
+                for item in value:
+                    if item in bitmaps:
+                        selected |= bitmaps[item]
+            words = selected if words is None else words & selected
+        if words is None:
+            return None
+        return np.unpackbits(words.view(np.uint8), count=self.n_rows).view(bool)
+
+    def _table(self, by, counts, sums, sort_by_count):
+        # Aggregate table of one grouping from its dense count and sum arrays
+        counts = counts[tuple(slice(len(self._keys[column][1])) for column in by)]
+        sums = sums[tuple(slice(len(self._keys[column][1])) for column in by)]
+        present = np.flatnonzero(counts)
+        if sort_by_count:
+            present = present[np.argsort(-counts.ravel()[present], kind="stable")]
+        key_codes = np.unravel_index(present, counts.shape)
+        table = {}
+        for column, codes in zip(by, key_codes):
+            _, values, dtype = self._keys[column]
+            if isinstance(dtype, pd.CategoricalDtype):
+                table[column] = pd.Categorical.from_codes(codes, dtype=dtype)
+            else:
+                table[column] = np.asarray(values)[codes]
+        table["Accidents"] = counts.ravel()[present].astype(np.int64)
+        table["Fatalities"] = sums.ravel()[present].astype(self._fatalities_dtype)
+        return pd.DataFrame(table)
+
+    def _bincounts(self, codes, size, rows, fatalities):
+        # Crash count and fatality sum per code, over the given rows (None: all rows)
+        if rows is not None:
+            codes = codes.take(rows)
+        return np.stack([
+            np.bincount(codes, minlength=size),
+            np.bincount(codes, weights=fatalities, minlength=size),
+        ])
+
+    def aggregates(self, filter_state):
+        """
+        The aggregate tables of build_aggregates over the rows matching the filter state.
+        """
+        mask = self.mask(filter_state)
+        rows, complement = None, False
+        if mask is not None:
+            # A large selection is computed as all rows minus the unselected ones
+            complement = np.count_nonzero(mask) > self.n_rows // 2
+            rows = np.flatnonzero(~mask if complement else mask)
+            fatalities = self.fatalities.take(rows)
+
+        tables = {}
+        for columns, shape, codes, totals in self._cubes:
+            # Counts and sums stacked on a leading axis, reduced together
+            if rows is None:
+                cube = totals
+            else:
+                cube = self._bincounts(codes, int(np.prod(shape)), rows, fatalities)
+                if complement:
+                    cube = totals - cube
+            cube = cube.reshape((2,) + shape)
+            for name, (by, sort_by_count) in GROUPINGS.items():
+                if not set(by) <= set(columns):
+                    continue
+                other_axes = tuple(i + 1 for i, column in enumerate(columns) if column not in by)
+                # The remaining axes are in cube order, put them in grouping order
+                remaining = [column for column in columns if column in by]
+                order = [0] + [remaining.index(column) + 1 for column in by]
+                counts, sums = cube.sum(axis=other_axes).transpose(order)
+                tables[name] = self._table(by, counts, sums, sort_by_count)
+        return {name: tables[name] for name in GROUPINGS}
@@ -0,0 +1,191 @@
+"""
+Typed columnar data store for the dashboard.
+
+Run `python data_store.py` as a build step to convert the CSV files in Data/
+into Arrow IPC (Feather) files. The dashboard loads those files with
+`load_clean_data()` / `load_raw_data()` and falls back to the CSV files when
+the Feather files (or pyarrow) are not available, or older than their CSV file
+(or, for the cleaned dataset and its coordinates, than Data/gazetteer.csv).
+
+The files are written uncompressed and memory-mapped on load: the numeric and
+string columns of the frames point into the mapped file instead of a private
+copy, so every worker process reads the same pages of the OS page cache. Files
+are replaced atomically, never rewritten in place, so a worker still mapping
+the previous version keeps reading it.
+
+The build step also writes a small metadata file with the raw dataset's row
+count, columns and first rows, so the home tab does not need the raw data
+until a table page is requested (`load_raw_metadata()`).
+"""
+import hashlib
+import json
+import os
+import pandas as pd
+
+##############################################################################################################################
+# File locations
+DATA_DIR = "Data"
+RAW_CSV = os.path.join(DATA_DIR, "Airplane_Crashes_and_Fatalities_Since_1908.csv")
+CLEAN_CSV = os.path.join(DATA_DIR, "cleaned_airplane_crashes.csv")
+RAW_STORE = os.path.join(DATA_DIR, "Airplane_Crashes_and_Fatalities_Since_1908.feather")
+CLEAN_STORE = os.path.join(DATA_DIR, "cleaned_airplane_crashes.feather")
+RAW_METADATA = os.path.join(DATA_DIR, "Airplane_Crashes_and_Fatalities_Since_1908.meta.json")
+# Place names and coordinates of the offline geocoder (geocoder.py)
+GAZETTEER = os.path.join(DATA_DIR, "gazetteer.csv")
+# English stopwords of the word clouds (token_index.py)
+STOPWORDS = os.path.join(DATA_DIR, "stopwords_english.txt")
+
+# Rows of the raw dataset kept in the metadata file (at least one data table page)
+RAW_PREVIEW_ROWS = 25
+
+##############################################################################################################################
+# Schema of the cleaned dataset
+MONTH_ORDER = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+INT_COLUMNS = ["Year", "Aboard", "Fatalities", "Ground"]
+CATEGORY_COLUMNS = ["Operator_Type", "Causes", "Country"]
+
+
+def apply_clean_schema(df):
+    """
+    Cast the cleaned dataset to its typed schema: integer counts, datetime Date,
+    ordered Month and dictionary-encoded categoricals, plus the coordinates of its
+    locations (geocoder.add_coordinates).
+    """
+    from geocoder import add_coordinates
+
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    for col in INT_COLUMNS:
+        df[col] = df[col].astype("int32")
+    df["Month"] = pd.Categorical(df["Month"], categories=MONTH_ORDER, ordered=True)
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype("category")
+    return add_coordinates(df)
+
+
+def _feather_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _store_is_fresh(store_path, *source_paths):
+    # A store older than one of its sources was built from a previous version of the data
+    return os.path.exists(store_path) and all(
+        os.path.getmtime(store_path) >= os.path.getmtime(source_path) for source_path in source_paths
+    )
+
+
+def _read_store(store_path, *source_paths):
+    # Feather keeps dtypes (including categoricals), so no parsing is needed;
+    # split_blocks keeps each column a zero-copy view of the mapped file
+    if not _store_is_fresh(store_path, *source_paths):
+        return None
+    if os.path.exists(store_path) and _feather_available():
+        from pyarrow import feather
+        return feather.read_table(store_path, memory_map=True).to_pandas(split_blocks=True)
+    return None
+
+
+def _write_store(df, store_path):
+    # Compressed files would be decompressed into each process' own memory
+    tmp_path = f"{store_path}.tmp"
+    df.to_feather(tmp_path, compression="uncompressed")
+    os.replace(tmp_path, store_path)
+
+##############################################################################################################################
+# Loaders used by the dashboard
+def load_clean_data():
+    # The coordinates in the store come from the gazetteer too
+    df = _read_store(CLEAN_STORE, CLEAN_CSV, GAZETTEER)
+    if df is None:
+        df = apply_clean_schema(pd.read_csv(CLEAN_CSV))
+    return df
+
+
+def load_raw_data():
+    df = _read_store(RAW_STORE, RAW_CSV)
+    if df is None:
+        df = pd.read_csv(RAW_CSV)
+    return df
+
+
+def _file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _file_signature(path):
+    # Size and modification time: checked without reading the file
+    stat = os.stat(path)
+    return {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns}
+
+
+def load_raw_metadata():
+    """
+    Row count, columns and first rows of the raw dataset, or None when the metadata
+    file is missing or the raw CSV has changed (size or modification time) since it
+    was built.
+    """
+    try:
+        with open(RAW_METADATA) as f:
+            metadata = json.load(f)
+        signature = _file_signature(RAW_CSV)
+    except (OSError, ValueError):
+        return None
+    if any(metadata.get(key) != value for key, value in signature.items()):
+        return None
+    return metadata
+
+##############################################################################################################################
+# Build step
+def build_store():
+    """
+    Write the typed Feather copies of both CSV files and return their paths.
+    """
+    if not _feather_available():
+        raise RuntimeError("pyarrow is required to build the columnar data store.")
+
+    clean = apply_clean_schema(pd.read_csv(CLEAN_CSV))
+    _write_store(clean, CLEAN_STORE)
+
+    raw = pd.read_csv(RAW_CSV)
+    _write_store(raw, RAW_STORE)
+    build_raw_metadata(raw)
+    return [CLEAN_STORE, RAW_STORE, RAW_METADATA]
+
+
+def build_raw_metadata(raw):
+    """
+    Write the raw dataset's metadata file. The preview rows are formatted like the
+    data table pages (indexes.TableIndex).
+    """
+    from indexes import TableIndex
+
+    table_index = TableIndex(raw.head(RAW_PREVIEW_ROWS))
+    # The hash identifies the source for humans and tools; loading only checks the signature
+    metadata = {
+        **_file_signature(RAW_CSV),
+        "source_sha256": _file_hash(RAW_CSV),
+        "rows": len(raw),
+        "columns": table_index.columns,
+        "preview": table_index.page(0, RAW_PREVIEW_ROWS)[0],
+    }
+    tmp_path = f"{RAW_METADATA}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(metadata, f)
+    os.replace(tmp_path, RAW_METADATA)
+    return RAW_METADATA
+
+
+if __name__ == "__main__":
+    for path in build_store():
+        print(f"✓ Data store written to: {path} ({os.path.getsize(path) / 1024:.0f} KiB)")
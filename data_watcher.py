@@ -0,0 +1,95 @@
+"""
+Reload of the dashboard data when the files in Data/ change.
+
+A `DataWatcher` thread polls the size and modification time of the data files.
+Once a change has settled (the files are unchanged over two polls, so a file
+still being written is not read), it calls its `reload` function: the
+dashboard's builds a complete new snapshot in that background thread and
+publishes it with snapshot.publish(). Requests keep reading the previous
+snapshot until the single reference swap, and the figure caches are keyed by
+the snapshot version, so no request sees a partly built or mixed state. A
+failed reload (e.g. a malformed CSV) is logged and the previous snapshot stays
+served.
+
+Under gunicorn the watcher runs in the master instead and only signals it: the
+snapshot is rebuilt once there and the workers are forked again from it
+(gunicorn.conf.py).
+"""
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 5.0
+
+
+def file_signature(paths):
+    # (size, modification time) of each file, None when missing
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+class DataWatcher:
+    def __init__(self, paths, reload, interval=DEFAULT_INTERVAL):
+        self.paths = list(paths)
+        self.reload = reload
+        self.interval = interval
+        self.reloads = 0
+        self.failures = 0
+        self._signature = file_signature(self.paths)
+        # Signature seen at the last poll, while waiting for it to settle
+        self._pending = None
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+
+    def check(self):
+        """
+        Reload if the files changed since the last reload and were unchanged since
+        the previous call. Returns True when a reload ran.
+        """
+        signature = file_signature(self.paths)
+        if signature == self._signature:
+            self._pending = None
+            return False
+        if signature != self._pending:
+            # Changed since the last poll: wait for the writer to finish
+            self._pending = signature
+            return False
+        try:
+            self.reload()
+        except Exception:
+            self.failures += 1
+            logger.exception("Reloading the data failed, still serving the previous version")
+        else:
+            self.reloads += 1
+        # Not retried until the files change again
+        self._signature, self._pending = signature, None
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        """
+        Start polling in a daemon thread, once per process.
+        """
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return self
+        self._pid = os.getpid()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="data-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,127 @@
+"""
+Bounded LRU cache for the figures returned by the chart callbacks.
+
+Most callback inputs have tiny domains (a few checklist subsets, or no input at
+all), so the figures are cached per (callback, normalized inputs, data version)
+as their serialized JSON. A cache hit skips pandas and Plotly entirely.
+"""
+import functools
+import itertools
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+
+from figure_theme import compact_figure
+
+try:
+    # Plotly already encodes with orjson when it is installed; decode with it too
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Returned by FigureCache.get on a miss: a cached None (an empty output) is a hit
+MISSING = object()
+
+
+def serialize_figure(fig):
+    """
+    Return the figure as the plain JSON structure Dash sends to the browser,
+    without the attributes its template or Plotly.js default to.
+    """
+    if isinstance(fig, go.Figure):
+        return compact_figure(json_loads(fig.to_json()))
+    return fig
+
+
+def ignore_inputs(*args):
+    # For callbacks whose output does not depend on their inputs
+    return (None,)
+
+
+def ordered_subset(options):
+    """
+    Normalizer for checklist values: the selected options as a tuple in the
+    checklist's own order, so every click order maps to the same figure.
+    """
+    def normalize(selected):
+        selected = set(selected or [])
+        return (tuple(option for option in options if option in selected),)
+    return normalize
+
+
+def all_subsets(options):
+    """
+    Every subset of a checklist's options, used to enumerate its input space.
+    """
+    return [
+        list(subset)
+        for size in range(len(options) + 1)
+        for subset in itertools.combinations(options, size)
+    ]
+
+
+class FigureCache:
+    def __init__(self, maxsize=128, version=None):
+        # `version` returns the current data version; entries of older versions never match again
+        self.maxsize = maxsize
+        self.version = version or (lambda: 0)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def memoize(self, normalize=None):
+        """
+        Decorator caching a figure callback. `normalize` maps the callback inputs
+        to a tuple of hashable arguments; the callback is called with those
+        normalized arguments so the cached figure always matches its key.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args):
+                norm_args = normalize(*args) if normalize else args
+                key = (func.__name__, norm_args, self.version())
+                figure = self.get(key)
+                if figure is MISSING:
+                    figure = serialize_figure(func(*norm_args))
+                    self.put(key, figure)
+                return figure
+            return wrapper
+        return decorator
+
+    def warm_up(self, callbacks):
+        """
+        Pre-render figures. `callbacks` maps each memoized callback to the list of
+        input tuples to render; returns the number of figures rendered.
+        """
+        rendered = 0
+        for callback, input_space in callbacks.items():
+            for inputs in input_space:
+                callback(*inputs)
+                rendered += 1
+        return rendered
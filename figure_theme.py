@@ -0,0 +1,119 @@
+"""
+Shared dark theme of the dashboard figures and compaction of their JSON.
+
+Every figure carries its template in layout.template, and Plotly's default
+template styles every trace type Plotly knows: about 7 KB re-sent with each
+chart update. The dashboard registers one compact template instead, holding
+Plotly's defaults for the trace types and layout parts the charts use plus the
+dark styling they share, and makes it the default of go.Figure and Plotly
+Express.
+
+`compact_figure` then drops from a serialized figure the attributes the browser
+already gets from the template or from Plotly.js' own defaults.
+"""
+import plotly.graph_objects as go
+import plotly.io as pio
+
+TEMPLATE_NAME = "dashboard_dark"
+BACKGROUND = "#0E1117"
+
+# Trace types and layout parts of Plotly's default template the charts use
+TRACE_TYPES = ["bar", "choropleth", "pie", "scatter", "scattermap"]
+LAYOUT_KEYS = [
+    "annotationdefaults", "autotypenumbers", "coloraxis", "colorway", "font",
+    "hoverlabel", "hovermode", "title", "xaxis", "yaxis",
+]
+
+# Styling shared by every chart
+DARK_LAYOUT = dict(
+    paper_bgcolor=BACKGROUND,
+    plot_bgcolor=BACKGROUND,
+    font=dict(color="white"),
+    title=dict(font=dict(size=22)),
+    legend=dict(bgcolor="rgba(0,0,0,0)"),
+    xaxis=dict(showline=True, linecolor="gray", gridcolor="#333"),
+    yaxis=dict(showline=True, linecolor="gray", gridcolor="#333"),
+)
+
+# Plotly.js defaults of attributes Plotly Express writes out explicitly
+PLOTLY_DEFAULTS = {
+    "trace": {"legendgroup": "", "showlegend": True, "xaxis": "x", "yaxis": "y", "geo": "geo"},
+    "bar": {"textposition": "auto", "marker": {"pattern": {"shape": ""}}},
+    "scatter": {"line": {"dash": "solid"}, "marker": {"symbol": "circle"}},
+    "layout": {
+        "xaxis": {"domain": [0, 1]},
+        "yaxis": {"domain": [0, 1]},
+        "geo": {"domain": {"x": [0, 1], "y": [0, 1]}},
+    },
+}
+
+
+def dark_template():
+    base = pio.templates["plotly"]
+    layout = base.layout.to_plotly_json()
+    # Only the colorbar of the color axis: the charts always set their colorscale
+    layout["coloraxis"] = {"colorbar": layout["coloraxis"]["colorbar"]}
+    template = go.layout.Template(
+        layout={key: layout[key] for key in LAYOUT_KEYS},
+        data={trace_type: base.data[trace_type] for trace_type in TRACE_TYPES},
+    )
+    template.layout.update(DARK_LAYOUT)
+    return template
+
+
+def register_template():
+    """
+    Register the dashboard template and make it the default of every new figure.
+    """
+    pio.templates[TEMPLATE_NAME] = dark_template()
+    pio.templates.default = TEMPLATE_NAME
+
+
+def _merge(base, override):
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            value = _merge(merged[key], value)
+        merged[key] = value
+    return merged
+
+
+def _strip(value, defaults):
+    # Drop the entries equal to their default, null ones and the dicts left empty
+    stripped = {}
+    for key, item in value.items():
+        default = defaults.get(key)
+        if isinstance(item, dict):
+            item = _strip(item, default if isinstance(default, dict) else {})
+            if not item:
+                continue
+        elif item is None or item == default:
+            continue
+        stripped[key] = item
+    return stripped
+
+
+def compact_figure(figure):
+    """
+    Serialized figure without the attributes equal to what its template or
+    Plotly.js would use anyway.
+    """
+    layout = figure.get("layout", {})
+    template = layout.get("template", {})
+    template_data = template.get("data", {})
+
+    data = []
+    for trace in figure.get("data", []):
+        trace_type = trace.get("type", "scatter")
+        defaults = _merge(PLOTLY_DEFAULTS["trace"], PLOTLY_DEFAULTS.get(trace_type, {}))
+        # The template styles traces by cycling through its entries; a single one applies to all
+        entries = template_data.get(trace_type, [])
+        if len(entries) == 1:
+            defaults = _merge(defaults, entries[0])
+        data.append({"type": trace_type, **_strip(trace, defaults)})
+
+    defaults = _merge(PLOTLY_DEFAULTS["layout"], template.get("layout", {}))
+    compact_layout = _strip({key: item for key, item in layout.items() if key != "template"}, defaults)
+    if template:
+        compact_layout["template"] = template
+    return {**figure, "data": data, "layout": compact_layout}
@@ -0,0 +1,213 @@
+"""
+Offline geocoder from free-text Location strings to coordinates.
+
+Locations are resolved against the gazetteer bundled in Data/gazetteer.csv
+(countries and their historical names, US states and other regions, seas and
+oceans, and the cities that recur in the dataset), without any network lookup.
+A location is split on its commas ("Near Anchorage, Alaska") and resolved to:
+
+    - a city: its first part, with "Near", "Off", "Over"... dropped, when the
+      other parts agree with the city's region or country ("Portland, Oregon"
+      vs "Portland, Maine"), or with the row's Country when there are none
+    - otherwise a region or water body named in any part, when it agrees with
+      the countries named in the location or with the row's Country
+    - otherwise a country named in any part, or the row's Country
+
+Each distinct (Location, Country) pair is resolved once, and memoized by its
+normalized spelling, so the cost depends on the number of distinct strings,
+not on the number of rows.
+`add_coordinates` stores the result as float32 Latitude / Longitude columns and
+a Geo_Precision category (city, region, water or country; missing when the
+location could not be placed).
+"""
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from data_store import GAZETTEER
+
+PRECISIONS = ["city", "region", "water", "country"]
+
+# Words in front of the place name ("Near Moscow", "Off the coast of ...")
+LEADING_WORDS = re.compile(r"^(?:(?:near|off|over|the|about|outside|at|in)\s+)+")
+# Longest place name of the gazetteer, in words, matched inside a part
+MAX_NAME_WORDS = 4
+# "latitude, longitude" typed as decimal degrees
+COORDINATES = re.compile(r"^\s*([-+]?\d+(?:\.\d*)?)\s*[,;\s]\s*([-+]?\d+(?:\.\d*)?)\s*$")
+
+
+def normalize_places(values):
+    """
+    Lower case, accents and dots dropped, "Saint" as "st", and anything but letters
+    and commas as single spaces (which also drops numbers such as "10 miles"), for
+    a whole Series of strings at once.
+    """
+    text = pd.Series(values, dtype="str").str.normalize("NFKD").str.replace(r"[^\x00-\x7f]", "", regex=True)
+    text = text.str.lower().str.replace(r"[.']", "", regex=True)
+    text = text.str.replace(r"\bsaint\b", "st", regex=True)
+    return text.str.replace(r"[^a-z,]+", " ", regex=True)
+
+
+def _ngrams(part):
+    words = part.split()
+    for size in range(min(MAX_NAME_WORDS, len(words)), 0, -1):
+        for start in range(len(words) - size + 1):
+            yield " ".join(words[start:start + size])
+
+
+class Geocoder:
+    def __init__(self, gazetteer=None):
+        """
+        `gazetteer` is a path or a DataFrame with the columns of Data/gazetteer.csv:
+        name, region, country, kind, latitude, longitude.
+        """
+        if gazetteer is None or isinstance(gazetteer, str):
+            gazetteer = pd.read_csv(gazetteer or GAZETTEER, keep_default_na=False)
+        self.places = list(gazetteer[["region", "country", "kind", "latitude", "longitude"]].itertuples(index=False))
+        self._cities = defaultdict(list)
+        self._areas = defaultdict(list)
+        # Centroid of each country, for the rows resolved from their Country column alone
+        self._countries = {}
+        names = normalize_places(gazetteer["name"]).str.strip()
+        for position, (name, key, place) in enumerate(zip(gazetteer["name"], names, self.places)):
+            (self._cities if place.kind == "city" else self._areas)[key].append(position)
+            if place.kind == "country" and name == place.country:
+                self._countries[name] = position
+        # Places named in each normalized location, then the position of each (location, country)
+        self._named = {}
+        self._resolved = {}
+        # Per gazetteer position, plus a last entry for the unresolved locations
+        self._latitude = np.append(gazetteer["latitude"].to_numpy(np.float32), np.float32(np.nan))
+        self._longitude = np.append(gazetteer["longitude"].to_numpy(np.float32), np.float32(np.nan))
+        self._precision = np.append([PRECISIONS.index(place.kind) for place in self.places], -1).astype(np.int8)
+
+    def _find_areas(self, parts):
+        # Regions, water bodies and countries named in the parts; short abbreviations only as a whole part
+        found = []
+        for part in parts:
+            for name in _ngrams(part):
+                if len(name) > 2 or name == part:
+                    found.extend(position for position in self._areas.get(name, []) if position not in found)
+        return found
+
+    def _city_candidates(self, part):
+        name = LEADING_WORDS.sub("", part)
+        return self._cities.get(name) or self._cities.get(name.rsplit(" of ", 1)[-1], [])
+
+    def _best_city(self, candidates, context, country):
+        if not context:
+            # Nothing else in the location: the row's Country decides
+            agreeing = [position for position in candidates if self.places[position].country == country]
+            if agreeing or country:
+                return agreeing[0] if agreeing else None
+            return candidates[0] if len(candidates) == 1 else None
+        regions = {self.places[position].region for position in context}
+        countries = {self.places[position].country for position in context}
+        best, best_score = None, 0
+        for position in candidates:
+            place = self.places[position]
+            score = 2 if place.region and place.region in regions else 1 if place.country in countries else 0
+            if score > best_score:
+                best, best_score = position, score
+        return best
+
+    def _best_area(self, areas, country):
+        countries = [position for position in areas if self.places[position].kind == "country"]
+        regions = [position for position in areas if self.places[position].kind != "country"]
+        named = {self.places[position].country for position in countries} | {country}
+        for position in regions:
+            # Water bodies span countries; a region must lie in a country the row refers to
+            if self.places[position].kind == "water" or self.places[position].country in named:
+                return position
+        if regions and not countries:
+            return regions[0]
+        for position in countries:
+            if self.places[position].country == country:
+                return position
+        # The most general part (usually the last one) names the country
+        return countries[-1] if countries else None
+
+    def _places_named(self, text):
+        # City candidates of the first part, places named in the other parts, places named in any part
+        if text not in self._named:
+            parts = [part.strip() for part in text.split(",") if part.strip()]
+            if parts:
+                self._named[text] = (
+                    self._city_candidates(parts[0]), self._find_areas(parts[1:]), self._find_areas(parts)
+                )
+            else:
+                self._named[text] = ([], [], [])
+        return self._named[text]
+
+    def _resolve(self, text, country):
+        key = (text, country)
+        if key not in self._resolved:
+            candidates, context, areas = self._places_named(text)
+            position = self._best_city(candidates, context, country)
+            if position is None:
+                position = self._best_area(areas, country)
+            if position is None:
+                position = self._countries.get(country)
+            self._resolved[key] = position
+        return self._resolved[key]
+
+    def resolve_one(self, location, country=None):
+        """
+        Gazetteer position of one location, or None when it cannot be placed.
+        """
+        text = normalize_places([location])[0] if isinstance(location, str) else ""
+        return self._resolve(text, country)
+
+    def locate(self, text):
+        """
+        (latitude, longitude) of a place typed by a user, either as decimal degrees
+        ("61.17, -150.0") or as a location resolved like the dataset's; None when it
+        cannot be placed.
+        """
+        match = COORDINATES.match(text or "")
+        if match:
+            latitude, longitude = float(match[1]), float(match[2])
+            return (latitude, longitude) if abs(latitude) <= 90 and abs(longitude) <= 180 else None
+        position = self.resolve_one(text)
+        if position is None:
+            return None
+        return float(self.places[position].latitude), float(self.places[position].longitude)
+
+    def resolve(self, locations, countries):
+        """
+        Latitude and longitude (float32, NaN when unresolved) and precision codes
+        (positions in PRECISIONS, -1 when unresolved) of two aligned Series.
+        """
+        # Distinct locations, then distinct normalized spellings ("St. Louis", "Saint Louis")
+        location_codes, location_uniques = pd.factorize(pd.Series(locations).reset_index(drop=True))
+        text_codes, texts = pd.factorize(normalize_places(location_uniques))
+        texts = list(texts) + [""]
+        # Missing values (code -1) take the last entry
+        text_codes = np.append(text_codes, len(texts) - 1)[location_codes]
+        country_codes, country_uniques = pd.factorize(pd.Series(countries).reset_index(drop=True))
+        country_uniques = list(country_uniques) + [None]
+        country_codes = np.where(country_codes < 0, len(country_uniques) - 1, country_codes)
+
+        # Every distinct (spelling, country) pair once
+        n_countries = len(country_uniques)
+        pair_codes, pairs = pd.factorize(text_codes.astype(np.int64) * n_countries + country_codes)
+        unresolved = len(self.places)
+        positions = [self._resolve(texts[pair // n_countries], country_uniques[pair % n_countries]) for pair in pairs]
+        positions = np.array([unresolved if p is None else p for p in positions], dtype=np.intp)[pair_codes]
+        return self._latitude[positions], self._longitude[positions], self._precision[positions]
+
+
+def add_coordinates(df, geocoder=None):
+    """
+    Return the dataset with the Latitude, Longitude (float32) and Geo_Precision columns
+    of its Location and Country columns.
+    """
+    geocoder = geocoder or Geocoder()
+    latitude, longitude, precision = geocoder.resolve(df["Location"], df["Country"])
+    return df.assign(
+        Latitude=latitude,
+        Longitude=longitude,
+        Geo_Precision=pd.Categorical.from_codes(precision, categories=PRECISIONS),
+    )
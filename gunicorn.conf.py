@@ -0,0 +1,66 @@
+"""
+Gunicorn settings for serving the dashboard:
+
+    gunicorn Dashboard:server
+
+The app is imported and its dataset loaded once in the master process
+(preload_app), then every lazily built part of the snapshot is built before the
+workers are forked. Workers share those pages copy-on-write and start serving
+without importing or loading anything, so recycling one (max_requests) takes
+milliseconds instead of a full cold start.
+
+The data files are watched in the master too (data_watcher.py), so a change is
+loaded once for all workers: the watcher thread only polls the files and sends
+the master a SIGHUP. on_reload then rebuilds the snapshot in the master's main
+loop, and gunicorn forks new workers from it (sharing the new data the same
+way) and stops the old ones once they finish their requests. The thread takes
+no lock a worker could inherit held; the rebuild itself never runs in a thread
+of the master. `kill -HUP <master pid>` reloads the data by hand.
+"""
+import gc
+import os
+import signal
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 10000)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+preload_app = True
+
+# Recycle workers to bound memory growth; the jitter keeps them from restarting together
+max_requests = int(os.environ.get("MAX_REQUESTS", 2000))
+max_requests_jitter = max_requests // 10
+
+
+def when_ready(server):
+    # Runs in the master, after the app is loaded and before the first worker is forked
+    import Dashboard
+    from data_watcher import DataWatcher
+    from snapshot import current_snapshot
+
+    current_snapshot().materialize()
+    # Keep the garbage collector from touching (and so copying) the objects shared with the workers
+    gc.collect()
+    gc.freeze()
+    server.log.info("Dataset snapshot %s built before forking workers", current_snapshot().version)
+
+    if Dashboard.DATA_WATCH:
+        master = os.getpid()
+        DataWatcher(Dashboard.data_watcher.paths, lambda: os.kill(master, signal.SIGHUP),
+                    interval=Dashboard.data_watcher.interval).start()
+
+
+def on_reload(server):
+    # Runs in the master on SIGHUP, before the new workers are forked
+    import Dashboard
+    from snapshot import current_snapshot
+
+    gc.unfreeze()
+    try:
+        Dashboard.reload_snapshot()
+    except Exception:
+        Dashboard.data_watcher.failures += 1
+        server.log.exception("Reloading the data failed, still serving the previous version")
+    else:
+        Dashboard.data_watcher.reloads += 1
+        server.log.info("Dataset snapshot %s rebuilt, replacing the workers", current_snapshot().version)
+    gc.collect()
+    gc.freeze()
@@ -0,0 +1,477 @@
+"""
+Lookup indexes built once per dataset snapshot.
+
+Each index answers one kind of callback query (by date, by country, ...) with a
+binary search or a dict hit instead of a scan over every row. Results are row
+positions into the snapshot's cleaned frame (the raw frame for TableIndex).
+"""
+import bisect
+import functools
+import re
+
+import numpy as np
+import pandas as pd
+
+DAY_NS = np.int64(24 * 60 * 60 * 10**9)
+
+
+def _to_ns(date):
+    return np.int64(pd.Timestamp(date).as_unit("ns").value)
+
+
+class DateIndex:
+    """
+    Row positions sorted by date, queried with binary search (O(log n) per lookup).
+    """
+
+    def __init__(self, dates):
+        dates = pd.to_datetime(dates).to_numpy("datetime64[ns]")
+        positions = np.flatnonzero(~np.isnat(dates))
+        values = dates[positions].astype(np.int64)
+        # A stable sort keeps rows of the same day in dataset order
+        order = np.argsort(values, kind="stable")
+        self.positions = positions[order]
+        self.keys = values[order]
+
+    def _slice(self, start_ns, stop_ns):
+        lo = np.searchsorted(self.keys, start_ns, side="left")
+        hi = np.searchsorted(self.keys, stop_ns, side="left")
+        return self.positions[lo:hi]
+
+    def on(self, date):
+        """
+        Rows of crashes on the given day.
+        """
+        start = _to_ns(pd.Timestamp(date).normalize())
+        return self._slice(start, start + DAY_NS)
+
+    def between(self, start, end):
+        """
+        Rows of crashes from `start` to `end`, both days included.
+        """
+        start_ns = _to_ns(pd.Timestamp(start).normalize())
+        stop_ns = _to_ns(pd.Timestamp(end).normalize()) + DAY_NS
+        return self._slice(start_ns, stop_ns)
+
+    def in_month(self, year, month):
+        # e.g. in_month(1972, 3): all crashes in March 1972
+        start = pd.Timestamp(year=year, month=month, day=1)
+        return self.between(start, start + pd.offsets.MonthEnd(0))
+
+
+def _group_postings(codes, n_groups, fatalities):
+    """
+    Per group code: row count, fatality sum and posting list (sorted row positions).
+    Rows with a missing group (code -1) are left out.
+    """
+    fatalities = np.asarray(fatalities)
+    valid = codes >= 0
+    counts = np.bincount(codes[valid], minlength=n_groups)
+    sums = np.bincount(codes[valid], weights=fatalities[valid], minlength=n_groups)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+    postings = [order[bounds[code]:bounds[code + 1]] for code in range(n_groups)]
+    return counts, sums, postings
+
+
+def normalize_key(text):
+    # Keys are compared the way users type them: case and surrounding spaces ignored
+    return str(text).strip().lower()
+
+
+class CountryIndex:
+    """
+    Precomputed accident count, fatality sum and row positions per country,
+    keyed by normalized name, plus a sorted key array for prefix autocomplete.
+    """
+
+    def __init__(self, countries, fatalities):
+        codes, names = pd.factorize(countries, sort=True)
+        counts, sums, postings = _group_postings(codes, len(names), fatalities)
+
+        self.entries = {}
+        for code, name in enumerate(names):
+            key = normalize_key(name)
+            rows = postings[code]
+            if key in self.entries:
+                # Names differing only by case are merged, as the case-insensitive search did
+                entry = self.entries[key]
+                entry["accidents"] += int(counts[code])
+                entry["fatalities"] += int(sums[code])
+                entry["rows"] = np.sort(np.concatenate([entry["rows"], rows]))
+                continue
+            self.entries[key] = {
+                "name": name,
+                "accidents": int(counts[code]),
+                "fatalities": int(sums[code]),
+                "rows": rows,
+            }
+        self.keys = sorted(self.entries)
+
+    def get(self, country_name):
+        return self.entries.get(normalize_key(country_name))
+
+    def suggest(self, prefix, limit=10):
+        """
+        Country names starting with `prefix`, found by binary search in the sorted keys.
+        """
+        prefix = normalize_key(prefix)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self.keys, prefix)
+        stop = bisect.bisect_left(self.keys, prefix + "\uffff")
+        return [self.entries[key]["name"] for key in self.keys[start:min(stop, start + limit)]]
+
+
+class CauseIndex:
+    """
+    Per-cause statistics and posting lists: crash count, fatality sum, fatalities
+    per crash, year span, row positions and breakdowns by decade and operator type.
+    """
+
+    def __init__(self, df):
+        codes, names = pd.factorize(df["Causes"], sort=True)
+        counts, sums, postings = _group_postings(codes, len(names), df["Fatalities"])
+        years = df["Year"].to_numpy()
+        decades = years // 10 * 10
+        operator_types = df["Operator_Type"].astype(str).to_numpy()
+
+        self.causes = [str(name) for name in names]
+        self.entries = {}
+        for code, name in enumerate(self.causes):
+            rows = postings[code]
+            self.entries[name] = {
+                "crashes": int(counts[code]),
+                "fatalities": int(sums[code]),
+                "fatality_rate": sums[code] / counts[code] if counts[code] else 0.0,
+                "first_year": int(years[rows].min()),
+                "last_year": int(years[rows].max()),
+                "rows": rows,
+                "by_decade": _value_counts(decades[rows]),
+                "by_operator_type": _value_counts(operator_types[rows]),
+            }
+
+    def get(self, cause):
+        return self.entries.get(cause)
+
+
+def _value_counts(values):
+    # Sorted {value: count} of a small array
+    keys, counts = np.unique(values, return_counts=True)
+    return {key: int(count) for key, count in zip(keys.tolist(), counts)}
+
+
+##############################################################################################################################
+# Spatial queries on the geocoded crash positions
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(latitude, longitude, lat, lon):
+    """
+    Great-circle distances in km from (lat, lon) to each of the given positions.
+    """
+    latitude = np.radians(np.asarray(latitude, dtype=np.float64))
+    longitude = np.radians(np.asarray(longitude, dtype=np.float64))
+    lat, lon = np.radians(lat), np.radians(lon)
+    a = np.sin((latitude - lat) / 2) ** 2 + np.cos(lat) * np.cos(latitude) * np.sin((longitude - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _ranges(starts, stops):
+    # Concatenation of arange(start, stop) for each pair, without a Python loop
+    lengths = stops - starts
+    total = int(lengths.sum())
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(total)
+
+
+def _in_box(latitude, longitude, west, south, east, north):
+    # A box with west > east crosses the antimeridian
+    if west <= east:
+        in_longitude = (longitude >= west) & (longitude <= east)
+    else:
+        in_longitude = (longitude >= west) | (longitude <= east)
+    return in_longitude & (latitude >= south) & (latitude <= north)
+
+
+class GeoIndex:
+    """
+    Grid hash of the crash positions. Rows are sorted by the cell of a global grid
+    of `cell_degrees` cells numbered band by band, so the rows of a run of cells on
+    one latitude band are one slice of the sorted array, found by binary search:
+
+        - a bounding box costs one slice per band it crosses, then an exact
+          comparison on the rows of those cells only
+        - a radius query is the bounding box of the circle, then haversine
+          distances to its candidate rows
+        - a polygon (a lasso selection) is its bounding box, then a point in
+          polygon test
+
+    When the cells hold more than `scan_fraction` of the rows (a continent-sized
+    box), a vectorized scan of every row is faster than gathering them, and is used
+    instead. Rows without coordinates are never returned.
+    """
+
+    def __init__(self, latitude, longitude, cell_degrees=1.0, scan_fraction=0.1):
+        latitude = np.asarray(latitude, dtype=np.float32)
+        longitude = np.asarray(longitude, dtype=np.float32)
+        self.cell_degrees = cell_degrees
+        self.scan_fraction = scan_fraction
+        self.bands = int(np.ceil(180 / cell_degrees))
+        self.columns = int(np.ceil(360 / cell_degrees))
+        positions = np.flatnonzero(~np.isnan(latitude) & ~np.isnan(longitude))
+        cells = self._band(latitude[positions]) * self.columns + self._column(longitude[positions])
+        order = np.argsort(cells, kind="stable")
+        self.positions = positions[order]
+        self.keys = cells[order]
+        # Coordinates in cell order, so the rows of a slice are contiguous in memory,
+        # and in dataset order for the scans
+        self.latitude = latitude[self.positions]
+        self.longitude = longitude[self.positions]
+        self._row_latitude = latitude
+        self._row_longitude = longitude
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _band(self, latitude):
+        band = np.floor((np.asarray(latitude, dtype=np.float64) + 90) / self.cell_degrees)
+        return np.clip(band, 0, self.bands - 1).astype(np.int32)
+
+    def _column(self, longitude):
+        column = np.floor((np.asarray(longitude, dtype=np.float64) + 180) / self.cell_degrees)
+        return np.clip(column, 0, self.columns - 1).astype(np.int32)
+
+    def _slices(self, west, south, east, north):
+        # Start and stop of the entries (positions in cell order) of each band's cells overlapping the box
+        first = np.arange(self._band(south), self._band(north) + 1, dtype=self.keys.dtype) * self.columns
+        starts = np.searchsorted(self.keys, first + self._column(west), side="left")
+        stops = np.searchsorted(self.keys, first + self._column(east), side="right")
+        return starts, stops
+
+    def _boxes(self, west, south, east, north):
+        # A box crossing the antimeridian (west > east) as two boxes
+        if west <= east:
+            return [(west, south, east, north)]
+        return [(west, south, 180.0, north), (-180.0, south, east, north)]
+
+    def _candidates(self, boxes):
+        """
+        Entries, latitudes and longitudes of the rows in the cells overlapping the boxes;
+        entries None and the coordinates of every row when a scan is faster.
+        """
+        slices = [self._slices(*box) for box in boxes]
+        n_candidates = sum(int((stops - starts).sum()) for starts, stops in slices)
+        if n_candidates > self.scan_fraction * len(self._row_latitude):
+            return None, self._row_latitude, self._row_longitude
+        entries = np.concatenate([_ranges(starts, stops) for starts, stops in slices])
+        return entries, self.latitude[entries], self.longitude[entries]
+
+    def _rows(self, entries, hits):
+        # Row positions of the candidates hit by a query, in dataset order
+        if entries is None:
+            return np.flatnonzero(hits)
+        return np.sort(self.positions[entries[hits]])
+
+    def in_bounds(self, west, south, east, north):
+        """
+        Rows inside the box, edges included, in dataset order. A box with
+        west > east crosses the antimeridian.
+        """
+        entries, latitude, longitude = self._candidates(self._boxes(west, south, east, north))
+        return self._rows(entries, _in_box(latitude, longitude, west, south, east, north))
+
+    def within(self, lat, lon, radius_km):
+        """
+        Rows within `radius_km` of (lat, lon) in dataset order, and their distances in km.
+        """
+        span = radius_km / KM_PER_DEGREE
+        south, north = lat - span, lat + span
+        if south <= -90 or north >= 90:
+            # The circle contains a pole: every longitude
+            boxes = [(-180.0, max(south, -90.0), 180.0, min(north, 90.0))]
+        else:
+            # Widest on the parallel closest to the pole
+            lon_span = span / np.cos(np.radians(max(abs(south), abs(north))))
+            if lon_span >= 180:
+                boxes = [(-180.0, south, 180.0, north)]
+            else:
+                west = (lon - lon_span + 180) % 360 - 180
+                east = (lon + lon_span + 180) % 360 - 180
+                boxes = self._boxes(west, south, east, north)
+        entries, latitude, longitude = self._candidates(boxes)
+        distances = haversine_km(latitude, longitude, lat, lon)
+        near = distances <= radius_km
+        if entries is None:
+            return np.flatnonzero(near), distances[near]
+        positions, distances = self.positions[entries[near]], distances[near]
+        order = np.argsort(positions)
+        return positions[order], distances[order]
+
+    def in_polygon(self, polygon):
+        """
+        Rows inside a polygon of (lon, lat) vertices, in dataset order.
+        """
+        vertices = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+        if len(vertices) < 3:
+            return np.array([], dtype=self.positions.dtype)
+        west, south = vertices.min(axis=0)
+        east, north = vertices.max(axis=0)
+        entries, latitude, longitude = self._candidates([(west, south, east, north)])
+        in_box = np.flatnonzero(_in_box(latitude, longitude, west, south, east, north))
+        x = longitude[in_box].astype(np.float64)
+        y = latitude[in_box].astype(np.float64)
+        # Even-odd rule: count the edges crossed by a ray from each point towards +x
+        inside = np.zeros(len(in_box), dtype=bool)
+        for (x1, y1), (x2, y2) in zip(vertices, np.roll(vertices, -1, axis=0)):
+            if y1 == y2:
+                continue
+            inside ^= ((y1 > y) != (y2 > y)) & (x < x1 + (y - y1) * (x2 - x1) / (y2 - y1))
+        hits = np.zeros(len(latitude), dtype=bool)
+        hits[in_box[inside]] = True
+        return self._rows(entries, hits)
+
+
+##############################################################################################################################
+# Server-side DataTable paging, sorting and filtering
+FILTER_SYMBOLS = {"=": "eq", "!=": "ne", "<": "lt", "<=": "le", ">": "gt", ">=": "ge"}
+FILTER_OPERATORS = {"eq", "ne", "lt", "le", "gt", "ge", "contains", "datestartswith", "is"}
+FILTER_TERM = re.compile(r"^\{(?P<column>[^}]+)\}\s+(?P<operator>\S+)\s*(?P<value>.*)$")
+
+
+def parse_filter_query(filter_query):
+    """
+    DataTable filter_query ("{Operator} icontains Air && {Fatalities} > 100") as a
+    tuple of (column, operator, value, case_sensitive) terms. Unknown terms are dropped.
+    """
+    terms = []
+    for part in (filter_query or "").split(" && "):
+        match = FILTER_TERM.match(part.strip())
+        if not match:
+            continue
+        operator = FILTER_SYMBOLS.get(match["operator"], match["operator"])
+        case_sensitive = True
+        if operator[:1] in ("i", "s") and operator[1:] in FILTER_OPERATORS:
+            case_sensitive = operator[0] == "s"
+            operator = operator[1:]
+        if operator not in FILTER_OPERATORS:
+            continue
+        value = match["value"].strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'`":
+            value = value[1:-1]
+        terms.append((match["column"], operator, value, case_sensitive))
+    return tuple(terms)
+
+
+def _matches(uniques, operator, value, case_sensitive):
+    # Evaluates one filter term on the distinct values of a column
+    if operator == "is":
+        # Missing values have no code, every distinct value is "not blank"
+        return np.full(len(uniques), value == "not blank")
+    numeric = pd.api.types.is_numeric_dtype(uniques.dtype)
+    if numeric and operator not in ("contains", "datestartswith"):
+        number = pd.to_numeric(value, errors="coerce")
+        if pd.isna(number):
+            return np.zeros(len(uniques), dtype=bool)
+        values = uniques.to_numpy()
+    else:
+        number = value if case_sensitive else value.lower()
+        values = uniques.astype(str)
+        values = (values if case_sensitive else values.str.lower()).to_numpy(dtype=object)
+    if operator == "contains":
+        return np.array([number in text for text in values], dtype=bool)
+    if operator == "datestartswith":
+        return np.array([text.startswith(number) for text in values], dtype=bool)
+    compare = {
+        "eq": np.equal, "ne": np.not_equal, "lt": np.less,
+        "le": np.less_equal, "gt": np.greater, "ge": np.greater_equal,
+    }[operator]
+    return compare(values, number).astype(bool)
+
+
+class TableIndex:
+    """
+    Pages of a frame for a DataTable with custom paging, sorting and filtering.
+
+    Every column is factorized once into sorted codes. A sort permutation per
+    (column, direction) and a row mask per filter term are computed on first use
+    and cached, as is the filtered and sorted row order of each (filter, sort)
+    query. A page is then a slice of that order, whatever the page number, and
+    its `page_size` records are looked up from the codes, never from the frame.
+    """
+
+    def __init__(self, df, sort_values=None, cache_size=64):
+        # `sort_values` optionally replaces a column's values for ordering (e.g. parsed dates)
+        sort_values = sort_values or {}
+        self.df = df
+        self.columns = list(df.columns)
+        self._codes = {}
+        self._uniques = {}
+        self._values = {}
+        self._sort_codes = {}
+        for column in self.columns:
+            codes, uniques = pd.factorize(df[column], sort=True)
+            self._codes[column] = codes
+            self._uniques[column] = pd.Series(uniques)
+            # Code -1 (missing value) picks the trailing None
+            self._values[column] = np.append(self._uniques[column].to_numpy(dtype=object), None)
+            if column in sort_values:
+                sort_codes, sort_uniques = pd.factorize(sort_values[column], sort=True)
+                self._sort_codes[column] = (sort_codes, len(sort_uniques))
+            else:
+                self._sort_codes[column] = (codes, len(uniques))
+        self._term_mask = functools.lru_cache(maxsize=cache_size)(self._compute_term_mask)
+        self._permutation = functools.lru_cache(maxsize=cache_size)(self._compute_permutation)
+        self.rows = functools.lru_cache(maxsize=cache_size)(self._compute_rows)
+
+    def _sort_key(self, column, direction):
+        # Dense rank of every row; missing values sort last in both directions
+        codes, n_values = self._sort_codes[column]
+        key = codes if direction == "asc" else n_values - 1 - codes
+        return np.where(codes < 0, n_values, key)
+
+    def _compute_term_mask(self, term):
+        column, operator, value, case_sensitive = term
+        hits = _matches(self._uniques[column], operator, value, case_sensitive)
+        # Code -1 (missing value) picks the trailing entry
+        if operator == "is":
+            return np.append(hits, value == "blank")[self._codes[column]]
+        return np.append(hits, False)[self._codes[column]]
+
+    def _compute_permutation(self, sort_by):
+        keys = [self._sort_key(column, direction) for column, direction in sort_by]
+        if len(keys) == 1:
+            return np.argsort(keys[0], kind="stable")
+        # lexsort sorts by its last key first
+        return np.lexsort(keys[::-1])
+
+    def _compute_rows(self, terms, sort_by):
+        """
+        Row positions matching every filter term, in sort order.
+        """
+        rows = self._permutation(sort_by) if sort_by else np.arange(len(self.df))
+        if terms:
+            mask = functools.reduce(np.logical_and, (self._term_mask(term) for term in terms))
+            rows = rows[mask[rows]]
+        return rows
+
+    def page(self, page_current, page_size, sort_by=None, filter_query=None):
+        """
+        Records of one page and the page count, for DataTable's data and page_count; a
+        page past the last one returns the last page.
+        `sort_by` is the DataTable's [{"column_id": ..., "direction": ...}] list.
+        """
+        terms = tuple(term for term in parse_filter_query(filter_query) if term[0] in self._codes)
+        sort_by = tuple(
+            (item["column_id"], item["direction"]) for item in sort_by or []
+            if item["column_id"] in self._codes
+        )
+        rows = self.rows(terms, sort_by)
+        page_count = max(1, -(-len(rows) // page_size))
+        # A page past the end (the rows shrank under a new filter) shows the last page
+        start = min(page_current or 0, page_count - 1) * page_size
+        page_rows = rows[start:start + page_size]
+        values = [self._values[column][self._codes[column][page_rows]] for column in self.columns]
+        records = [dict(zip(self.columns, row)) for row in zip(*values)]
+        return records, page_count
@@ -0,0 +1,176 @@
+"""
+Prometheus metrics of the dashboard server.
+
+`instrument(app)` records, for every request to a server-side callback (Dash's
+_dash-update-component endpoint), its latency, response size and failure under
+the name of the callback function, through Flask request hooks: every callback
+is covered, including the ones registered later. The metrics, plus the gauges
+added with `add_metric`, are served in the Prometheus text format on /metrics.
+
+Recording one call is a few dictionary and list operations under a lock, cheap
+enough to stay on in production. Metrics are per process: under gunicorn each
+worker reports its own.
+"""
+import bisect
+import math
+import threading
+import time
+from collections import defaultdict
+
+from flask import Response, g, request
+
+# Histogram upper bounds: latency in seconds, response size in bytes
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CALLBACK_ENDPOINT = "_dash-update-component"
+# Label of the requests for outputs no callback has
+UNKNOWN_CALLBACK = "unknown"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _number(value):
+    if isinstance(value, float):
+        # Prometheus spells the special values NaN, +Inf and -Inf
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(value)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        # Bucket i counts the values <= buckets[i], the last one the rest
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            yield f"{name}_bucket{_labels(labels + (('le', bound),))} {cumulative}"
+        yield f"{name}_sum{_labels(labels)} {_number(self.sum)}"
+        yield f"{name}_count{_labels(labels)} {cumulative}"
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.size = defaultdict(lambda: Histogram(SIZE_BUCKETS))
+        self.errors = defaultdict(int)
+        # name -> (help, type, {labels: value or function returning the value})
+        self._extra = {}
+
+    def observe(self, callback, seconds, size, failed=False):
+        with self._lock:
+            self.latency[callback].observe(seconds)
+            self.size[callback].observe(size)
+            if failed:
+                self.errors[callback] += 1
+
+    def add_metric(self, name, help_text, kind, value, **labels):
+        """
+        Serve an extra gauge or counter; `value` may be a function, called on each scrape.
+        """
+        with self._lock:
+            _, _, samples = self._extra.setdefault(name, (help_text, kind, {}))
+            samples[tuple(sorted(labels.items()))] = value
+
+    def render(self):
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            lines = []
+            for name, help_text, histograms in [
+                ("dashboard_callback_duration_seconds", "Callback request latency.", self.latency),
+                ("dashboard_callback_response_bytes", "Callback response size.", self.size),
+            ]:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for callback in sorted(histograms):
+                    lines.extend(histograms[callback].lines(name, (("callback", callback),)))
+
+            name = "dashboard_callback_exceptions_total"
+            lines += [f"# HELP {name} Callback requests that raised an exception.", f"# TYPE {name} counter"]
+            for callback in sorted(self.latency):
+                lines.append(f"{name}{_labels((('callback', callback),))} {self.errors[callback]}")
+
+            for name, (help_text, kind, samples) in self._extra.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for labels, value in samples.items():
+                    lines.append(f"{name}{_labels(labels)} {_number(value() if callable(value) else value)}")
+        return "\n".join(lines) + "\n"
+
+##############################################################################################################################
+# Flask integration
+def callback_namer(app):
+    """
+    Function returning the name of the callback function the current request to
+    a Dash app's callback endpoint is for, or UNKNOWN_CALLBACK when its output is
+    not one of the app's callbacks (the output is sent by the client).
+    """
+    # Callback output id -> callback function name, of the registered callbacks only
+    names = {}
+    lock = threading.Lock()
+
+    def callback_name():
+        if len(names) != len(app.callback_map):
+            # Built on the first request, once every callback is registered
+            with lock:
+                names.clear()
+                names.update(
+                    (output, getattr(spec.get("callback"), "__name__", UNKNOWN_CALLBACK))
+                    for output, spec in app.callback_map.items()
+                )
+        output = (request.get_json(silent=True) or {}).get("output")
+        return names.get(output, UNKNOWN_CALLBACK) if isinstance(output, str) else UNKNOWN_CALLBACK
+
+    return callback_name
+
+
+def instrument(app, metrics=None, path="/metrics"):
+    """
+    Record every callback request of a Dash app and serve the metrics on `path`.
+    """
+    metrics = metrics or Metrics()
+    server = app.server
+    callback_name = callback_namer(app)
+
+    @server.before_request
+    def start_timer():
+        if request.path.endswith(CALLBACK_ENDPOINT):
+            g.callback_start = time.perf_counter()
+
+    @server.after_request
+    def record_callback(response):
+        start = g.pop("callback_start", None)
+        if start is not None:
+            # Unhandled exceptions reach this hook as a 500 response
+            metrics.observe(
+                callback_name(), time.perf_counter() - start,
+                response.calculate_content_length() or 0, failed=response.status_code >= 500,
+            )
+        return response
+
+    @server.route(path)
+    def serve_metrics():
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    return metrics
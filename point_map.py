@@ -0,0 +1,163 @@
+"""
+Server-side binning of the geocoded crash positions for the crash point map.
+
+The map is a WebGL scatter map (Plotly's Scattermap, drawn with MapLibre). At
+every pan and zoom the callback receives the new viewport, and instead of the
+crashes themselves it sends one marker per occupied grid cell of the viewport:
+
+    - cells are CELLS_PER_TILE per 256-pixel map tile, so their size in degrees
+      halves at each zoom level and a marker always covers about 16 pixels
+    - the viewport is snapped outwards to whole cells, so small pans reuse the
+      same cells (and the cached figure)
+    - each marker sits at the mean position of its crashes, sized and colored
+      by their count
+
+The payload is bounded by the number of cells of the viewport (a few thousand),
+whatever the number of crashes. Once the viewport holds at most MAX_POINTS
+crashes, they are sent individually instead.
+
+The map keeps counting longitudes past +-180 when panned around the globe; bounds
+are wrapped back into [-180, 180], with west > east for a viewport crossing the
+antimeridian.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+CELLS_PER_TILE = 16
+TILE_SIZE = 256
+MAX_POINTS = 500
+MAX_ZOOM = 16
+
+# Size of the map in pixels, to derive the viewport from its center and zoom
+MAP_WIDTH = 1100
+MAP_HEIGHT = 600
+DEFAULT_VIEW = {"center": {"lat": 20.0, "lon": 0.0}, "zoom": 1.0}
+
+
+def cell_size(zoom):
+    # Degrees of longitude per cell at an integer zoom level
+    return 360.0 / (2 ** zoom * CELLS_PER_TILE)
+
+
+def wrap_longitude(longitude):
+    # Map longitudes keep growing past +-180 when panning around the globe
+    return (longitude + 180) % 360 - 180
+
+
+def _clip_bounds(west, south, east, north):
+    # Unwrapped bounds (west <= east) as bounds in [-180, 180], west > east across the antimeridian
+    if east - west >= 360:
+        west, east = -180.0, 180.0
+    else:
+        west, east = wrap_longitude(west), wrap_longitude(east)
+        if east == -180.0:
+            east = 180.0
+    return west, max(south, -90.0), east, min(north, 90.0)
+
+
+def has_view(relayout_data):
+    # Pan and zoom events carry the map view; selections and autosize events do not
+    return bool(relayout_data) and "map.center" in relayout_data and "map.zoom" in relayout_data
+
+
+def viewport(relayout_data):
+    """
+    Integer zoom level and (west, south, east, north) bounds of the map after a
+    relayout event carrying its view (see has_view); the initial view for None.
+    """
+    relayout_data = relayout_data if has_view(relayout_data) else {}
+    center = relayout_data.get("map.center", DEFAULT_VIEW["center"])
+    zoom = relayout_data.get("map.zoom", DEFAULT_VIEW["zoom"])
+    level = min(max(int(math.floor(zoom)), 0), MAX_ZOOM)
+
+    corners = (relayout_data.get("map._derived") or {}).get("coordinates")
+    if corners:
+        lons = [corner[0] for corner in corners]
+        lats = [corner[1] for corner in corners]
+        return level, _clip_bounds(min(lons), min(lats), max(lons), max(lats))
+
+    # Web Mercator: degrees of longitude per pixel, and of latitude near the center
+    degrees = 360.0 / (TILE_SIZE * 2 ** zoom)
+    half_width = MAP_WIDTH / 2 * degrees
+    half_height = MAP_HEIGHT / 2 * degrees * math.cos(math.radians(center["lat"]))
+    return level, _clip_bounds(
+        center["lon"] - half_width, center["lat"] - half_height,
+        center["lon"] + half_width, center["lat"] + half_height,
+    )
+
+
+def split_bounds(bounds):
+    # Bounds crossing the antimeridian (west > east) as two boxes
+    west, south, east, north = bounds
+    if west <= east:
+        return [bounds]
+    return [(west, south, 180.0, north), (-180.0, south, east, north)]
+
+
+def snap_bounds(bounds, size):
+    # Bounds grown outwards to whole cells of the global grid
+    west, south, east, north = bounds
+    crosses = west > east
+    west, east = math.floor(west / size) * size, math.ceil(east / size) * size
+    if crosses and west <= east:
+        # Grown around the whole globe
+        west, east = -180.0, 180.0
+    return west, max(math.floor(south / size) * size, -90.0), east, min(math.ceil(north / size) * size, 90.0)
+
+
+def bin_points(latitude, longitude, fatalities, bounds, size, max_points=MAX_POINTS):
+    """
+    Crashes inside `bounds` binned into grid cells of `size` degrees. Returns a
+    DataFrame of Latitude, Longitude (mean position of the cell's crashes),
+    Crashes and Fatalities, and the positions of the crashes in view when there
+    are at most `max_points` of them (None otherwise, the frame then holding
+    one row per occupied cell).
+    """
+    west, south, east, north = bounds
+    in_view = np.flatnonzero(np.logical_or.reduce([
+        (longitude >= box_west) & (longitude <= box_east) & (latitude >= box_south) & (latitude <= box_north)
+        for box_west, box_south, box_east, box_north in split_bounds(bounds)
+    ]))
+    latitude, longitude, fatalities = latitude[in_view], longitude[in_view], fatalities[in_view]
+    if len(in_view) <= max_points:
+        return pd.DataFrame({
+            "Latitude": latitude, "Longitude": longitude,
+            "Crashes": np.ones(len(in_view), dtype=np.int64), "Fatalities": fatalities,
+        }), in_view
+
+    # Dense cell numbers: the viewport holds a bounded number of cells. Longitudes are
+    # counted eastwards from `west`, past the antimeridian when the viewport crosses it
+    width = east - west if west <= east else east - west + 360
+    offset = longitude.astype(np.float64) - west
+    if west > east:
+        offset[offset < 0] += 360
+    columns = int(math.ceil(width / size)) + 1
+    n_cells = (int(math.ceil((north - south) / size)) + 1) * columns
+    cell = (
+        np.floor((latitude - south) / size).astype(np.int64) * columns
+        + np.floor(offset / size).astype(np.int64)
+    )
+    counts = np.bincount(cell, minlength=n_cells)
+    occupied = np.flatnonzero(counts)
+    counts = counts[occupied]
+
+    def cell_sums(weights):
+        return np.bincount(cell, weights=weights, minlength=n_cells)[occupied]
+
+    return pd.DataFrame({
+        "Latitude": (cell_sums(latitude) / counts).astype(np.float32),
+        "Longitude": wrap_longitude(cell_sums(offset) / counts + west).astype(np.float32),
+        "Crashes": counts,
+        "Fatalities": cell_sums(fatalities).astype(np.int64),
+    }), None
+
+
+def map_view(relayout_data):
+    """
+    Normalized view of a relayout event: the zoom level and the viewport snapped to
+    its cells, the only inputs the binned figure depends on.
+    """
+    level, bounds = viewport(relayout_data)
+    return level, snap_bounds(bounds, cell_size(level))
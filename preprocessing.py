@@ -0,0 +1,250 @@
+"""
+Preprocessing pipeline producing Data/cleaned_airplane_crashes.csv.
+
+Scriptable version of notebook/preprocessing.ipynb, split into stages:
+
+    load -> impute -> time repair -> country extraction -> operator type
+         -> fatality rate -> cause extraction
+
+Every stage's output is cached in .pipeline_cache/ under the content hash of its
+input rows. Whole-frame stages are recomputed only when their input changes;
+row-wise stages (country, operator type, fatality rate, causes) only process the
+rows whose hash is not cached yet, so appending rows to the raw CSV only sends
+the new or changed rows through the expensive stages.
+
+    python preprocessing.py [--input RAW.csv] [--output CLEAN.csv] [--no-cache] [--store]
+"""
+import argparse
+import hashlib
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from cause_classifier import CauseClassifier
+from country_resolver import CountryResolver
+from data_store import CLEAN_CSV, MONTH_ORDER, RAW_CSV
+
+CACHE_DIR = ".pipeline_cache"
+
+# Malformed raw Time values and their corrections (from the notebook's manual review)
+TIME_FIXES = {
+    "c: 1:00": "01:00", "c:17:00": "17:00", "c: 2:00": "02:00", "c:09:00": "09:00",
+    "1:30": "01:30", "c16:50": "16:50", "12'20": "12:20", "18.40": "18:40",
+    "114:20": "14:20", "c14:30": "14:30", "0943": "09:43", "1:00": "01:00",
+    "2:40": "02:40", "22'08": "22:08", "c: 9:40": "09:40", "2:00": "02:00",
+    "8:02": "08:02", "9:30": "09:30",
+}
+
+# Missing-value markers of the raw CSV: pandas' defaults except "None", which is a
+# literal Route value (newer pandas versions would read it as missing)
+RAW_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "n/a", "nan", "null"
+]
+
+OUTPUT_COLUMNS = [
+    'Date', 'Year', 'Month', 'Day', 'Time', 'Country', 'Location', 'Operator', 'Operator_Type',
+    'Route', 'Type', 'Aboard', 'Fatalities', 'Fatality_Rate', 'Ground', 'Causes', 'Summary'
+]
+
+##############################################################################################################################
+# Stage cache
+def row_hashes(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def content_hash(df):
+    return hashlib.sha256(row_hashes(df).tobytes() + "|".join(df.columns).encode()).hexdigest()
+
+
+class StageCache:
+    def __init__(self, cache_dir=CACHE_DIR, enabled=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        if enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, stage):
+        return os.path.join(self.cache_dir, f"{stage}.pkl")
+
+    def _load(self, stage):
+        if self.enabled and os.path.exists(self._path(stage)):
+            with open(self._path(stage), "rb") as f:
+                return pickle.load(f)
+        return None
+
+    def _save(self, stage, value):
+        if self.enabled:
+            with open(self._path(stage), "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def frame_stage(self, stage, key, func):
+        """
+        Whole-frame stage: returns the cached output when `key` (the content hash of
+        the input) is unchanged, otherwise recomputes it. Returns (output, rows computed).
+        """
+        cached = self._load(stage)
+        if cached is not None and cached["key"] == key:
+            return cached["output"], 0
+        output = func()
+        self._save(stage, {"key": key, "output": output})
+        return output, len(output)
+
+    def row_stage(self, stage, inputs, func):
+        """
+        Row-wise stage: `func` maps the input rows to one output value per row and
+        only runs on rows whose content hash is not cached. Returns (output, rows computed).
+        """
+        hashes = row_hashes(inputs)
+        cached = self._load(stage)
+        if cached is None:
+            cached = pd.Series(dtype=object)
+        missing = ~np.isin(hashes, cached.index.to_numpy())
+        if missing.any():
+            todo = inputs[missing]
+            computed = pd.Series(np.asarray(func(todo), dtype=object), index=hashes[missing])
+            cached = pd.concat([cached, computed])
+            cached = cached[~cached.index.duplicated(keep="last")]
+            self._save(stage, cached)
+        output = pd.Series(cached.reindex(hashes).to_numpy(), index=inputs.index, dtype=object)
+        return output, int(missing.sum())
+
+##############################################################################################################################
+# Stages
+def impute(airplane):
+    """
+    Fill missing values, drop unused columns, fix dtypes and add the date features.
+    """
+    airplane = airplane.copy()
+    # Numeric values
+    num_columns = airplane.select_dtypes('float64').columns
+    for col in num_columns:
+        airplane[col] = airplane[col].fillna(airplane[col].mean())
+    airplane = airplane.drop(columns=["Flight #", "cn/In"], errors="ignore")
+    airplane["Summary"] = airplane["Summary"].fillna("No remark")
+    airplane["Registration"] = airplane["Registration"].fillna("unavailable")
+    airplane["Route"] = airplane["Route"].fillna("unavailable")
+    for col in ["Location", "Operator", "Type"]:
+        airplane[col] = airplane[col].fillna(airplane[col].mode()[0])
+
+    # Correct data types
+    airplane["Date"] = pd.to_datetime(airplane["Date"], errors="coerce")
+    for col in num_columns:
+        airplane[col] = airplane[col].astype(int)
+
+    # Date features
+    airplane["Year"] = airplane["Date"].dt.year
+    airplane["Month"] = pd.Categorical(
+        airplane["Date"].dt.month_name(), categories=MONTH_ORDER, ordered=True
+    )
+    airplane["Day"] = airplane["Date"].dt.day_name()
+    return airplane
+
+
+def repair_times(time_col):
+    """
+    Apply the known Time corrections, normalize to HH:MM and forward-fill missing times.
+    """
+    fixed = time_col.replace(TIME_FIXES)
+    fixed = pd.to_datetime(fixed, format="%H:%M", errors="coerce").dt.strftime("%H:%M")
+    return fixed.ffill()
+
+
+def operator_type(operators):
+    # Military when the operator mentions the military, a navy or an army
+    condition = operators.astype(str).str.contains("Military|Navy|Army")
+    return np.select([condition], ["Military"], default="Civilian")
+
+
+def fatality_rate(counts):
+    rate = (counts["Fatalities"] / counts["Aboard"]).round(2)
+    # Division by zero gives inf or NaN; those rows get a rate of 0
+    return rate.replace([np.inf, -np.inf], np.nan)
+
+
+def finalize(airplane):
+    """
+    Drop impossible rates, standardize text columns and order the output columns.
+    """
+    airplane = airplane[~(airplane["Fatality_Rate"] > 1)].copy()
+    airplane["Fatality_Rate"] = airplane["Fatality_Rate"].astype(float).fillna(0)
+    for col in ["Location", "Operator", "Type", "Route", "Month", "Day", "Operator_Type"]:
+        airplane[col] = airplane[col].astype(str).str.title().str.strip()
+    return airplane[OUTPUT_COLUMNS]
+
+##############################################################################################################################
+# Pipeline
+def run(input_path=RAW_CSV, output_path=CLEAN_CSV, cache=None):
+    """
+    Run every stage and write the cleaned CSV. Returns [(stage, seconds, rows computed)].
+    """
+    cache = cache or StageCache()
+    timings = []
+
+    def timed(stage, func):
+        start = time.perf_counter()
+        result, computed = func()
+        timings.append((stage, time.perf_counter() - start, computed))
+        return result
+
+    def load():
+        with open(input_path, "rb") as f:
+            key = hashlib.sha256(f.read()).hexdigest()
+        return cache.frame_stage("load", key, lambda: pd.read_csv(
+            input_path, keep_default_na=False, na_values=RAW_NA_VALUES
+        ))
+
+    airplane = timed("load", load)
+    airplane = timed("impute", lambda: cache.frame_stage("impute", content_hash(airplane), lambda: impute(airplane)))
+
+    # The forward fill makes this stage depend on the whole column
+    times = airplane[["Time"]]
+    airplane["Time"] = timed("time repair", lambda: cache.frame_stage(
+        "time_repair", content_hash(times), lambda: repair_times(times["Time"])
+    ))
+    airplane["Country"] = timed("country extraction", lambda: cache.row_stage(
+        "country", airplane[["Location"]], lambda rows: CountryResolver().resolve(rows["Location"])
+    ))
+    airplane["Operator_Type"] = timed("operator type", lambda: cache.row_stage(
+        "operator_type", airplane[["Operator"]], lambda rows: operator_type(rows["Operator"])
+    ))
+    airplane["Fatality_Rate"] = timed("fatality rate", lambda: cache.row_stage(
+        "fatality_rate", airplane[["Fatalities", "Aboard"]], fatality_rate
+    ))
+    airplane["Causes"] = timed("cause extraction", lambda: cache.row_stage(
+        "causes", airplane[["Summary"]], lambda rows: CauseClassifier().classify_batch(rows["Summary"])
+    ))
+
+    start = time.perf_counter()
+    cleaned = finalize(airplane)
+    cleaned.to_csv(output_path, index=False)
+    timings.append(("write", time.perf_counter() - start, len(cleaned)))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the cleaned airplane crashes dataset.")
+    parser.add_argument("--input", default=RAW_CSV, help="raw CSV file")
+    parser.add_argument("--output", default=CLEAN_CSV, help="cleaned CSV file to write")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="stage cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="recompute every stage")
+    parser.add_argument("--store", action="store_true", help="also rebuild the Feather data store")
+    args = parser.parse_args()
+
+    timings = run(args.input, args.output, StageCache(args.cache_dir, enabled=not args.no_cache))
+    for stage, seconds, computed in timings:
+        print(f"{stage:<20}{seconds * 1000:10.1f} ms   {computed:>8,} rows computed")
+    print(f"{'total':<20}{sum(t[1] for t in timings) * 1000:10.1f} ms")
+    print(f"✓ Cleaned data written to: {args.output}")
+
+    if args.store:
+        from data_store import build_store
+        for path in build_store():
+            print(f"✓ Data store written to: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+On-demand profiling of the dashboard callbacks and of the startup data load.
+
+Off unless enabled by environment variables:
+
+    PROFILE_CALLBACKS   comma-separated callback function names ("*" for all)
+                        profiled on every call
+    PROFILE_HEADER      a secret (16 characters or more): also profile any
+                        callback request sent with the "X-Profile: <secret>"
+                        header, so that clients cannot fill the disk with
+                        profiles
+    PROFILE_STARTUP=1   profile the data load and snapshot build at startup
+    PROFILE_DIR         output directory (default: profiles/)
+
+A profiled callback request is measured from Flask's request hooks, so the
+profile covers the callback itself, its figure construction and the JSON
+serialization and compression of the response. Two outputs per request:
+
+    - <dir>/<callback>/<time>-<pid>-<n>.prof: the cProfile profile of the call,
+      readable with pstats or snakeviz
+    - <dir>/<callback>.<pid>.folded: the call stacks sampled during every
+      profiled call of this process, in the collapsed format of flamegraph.pl
+      and speedscope (one "frame;frame;frame count" line per stack):
+
+        cat profiles/update_world_map.*.folded | flamegraph.pl > world_map.svg
+"""
+import collections
+import contextlib
+import cProfile
+import hmac
+import logging
+import os
+import sys
+import threading
+import time
+
+from flask import g, request
+
+from metrics import CALLBACK_ENDPOINT, callback_namer
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+# Shorter PROFILE_HEADER secrets are refused ("1" would let anyone trigger profiles)
+MIN_SECRET_LENGTH = 16
+# Seconds between two stack samples (the sampler also waits for the GIL)
+SAMPLE_INTERVAL = 0.001
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class StackSampler:
+    """
+    Samples the call stacks of the registered threads from a background thread,
+    and counts them per name.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = collections.defaultdict(collections.Counter)
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._sampler = None
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._threads:
+                    self._sampler = None
+                    return
+                threads = dict(self._threads)
+            frames = sys._current_frames()
+            samples = []
+            for thread_id, name in threads.items():
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                if stack:
+                    samples.append((name, ";".join(reversed(stack))))
+            with self._lock:
+                for name, stack in samples:
+                    self.stacks[name][stack] += 1
+            time.sleep(self.interval)
+
+    def add(self, name):
+        with self._lock:
+            self._threads[threading.get_ident()] = name
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._sampler.start()
+
+    def remove(self):
+        with self._lock:
+            self._threads.pop(threading.get_ident(), None)
+
+    def folded(self, name):
+        with self._lock:
+            stacks = sorted(self.stacks[name].items())
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+
+class CallbackProfiler:
+    def __init__(self, directory="profiles", callbacks=(), sampler=None):
+        self.directory = directory
+        self.callbacks = set(callbacks)
+        self.sampler = sampler or StackSampler()
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def selected(self, name):
+        return "*" in self.callbacks or name in self.callbacks
+
+    def start(self, name):
+        self.sampler.add(name)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one active cProfile per process: this call is only sampled
+            return None
+        return profile
+
+    def stop(self, name, profile):
+        self.sampler.remove()
+        if profile is not None:
+            profile.disable()
+            with self._lock:
+                self._calls += 1
+                call = self._calls
+            os.makedirs(os.path.join(self.directory, name), exist_ok=True)
+            profile.dump_stats(os.path.join(
+                self.directory, name, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{call}.prof"
+            ))
+        # Every sample of this process so far, rewritten whole so the file is never half written
+        path = os.path.join(self.directory, f"{name}.{os.getpid()}.folded")
+        with open(f"{path}.tmp", "w") as f:
+            f.write(self.sampler.folded(name))
+        os.replace(f"{path}.tmp", path)
+
+    @contextlib.contextmanager
+    def profile(self, name):
+        profile = self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name, profile)
+
+
+def profiler_from_env():
+    """
+    The profiler configured by the PROFILE_* environment variables.
+    """
+    callbacks = [name.strip() for name in os.environ.get("PROFILE_CALLBACKS", "").split(",") if name.strip()]
+    return CallbackProfiler(os.environ.get("PROFILE_DIR", "profiles"), callbacks)
+
+##############################################################################################################################
+# Flask integration
+def profile_callbacks(app, profiler=None, header_secret=None):
+    """
+    Profile the selected callbacks of a Dash app, and with `header_secret` any callback
+    request whose X-Profile header holds that secret. Call it before registering other
+    request hooks (metrics) so that the profile includes them.
+    """
+    profiler = profiler or profiler_from_env()
+    if header_secret is None:
+        header_secret = os.environ.get("PROFILE_HEADER", "")
+    if header_secret and len(header_secret) < MIN_SECRET_LENGTH:
+        logger.warning("PROFILE_HEADER is shorter than %d characters, header profiling disabled", MIN_SECRET_LENGTH)
+        header_secret = ""
+    header_secret = header_secret.encode()
+    if not profiler.callbacks and not header_secret:
+        return profiler
+    callback_name = callback_namer(app)
+
+    @app.server.before_request
+    def start_profile():
+        if not request.path.endswith(CALLBACK_ENDPOINT):
+            return
+        name = callback_name()
+        if profiler.selected(name) or (header_secret and hmac.compare_digest(
+                request.headers.get(PROFILE_HEADER, "").encode(), header_secret)):
+            g.callback_profile = (name, profiler.start(name))
+
+    # Teardown runs after every after_request hook (metrics, compression), even on errors
+    @app.server.teardown_request
+    def stop_profile(exception):
+        started = g.pop("callback_profile", None)
+        if started is not None:
+            profiler.stop(*started)
+
+    return profiler
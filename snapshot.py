@@ -0,0 +1,159 @@
+"""
+Read-only snapshot of the dashboard dataset.
+
+A snapshot bundles the raw and cleaned frames, the derived columns, the
+precomputed aggregates and the lookup indexes of one version of the data. It is
+built once, never mutated by callbacks, and replaced as a whole with
+`publish()`, so concurrent requests always read a consistent version.
+
+The raw frame may be given as a loader function: it is then read, and its data
+table and word cloud indexes built, on first use (`materialize()` builds them
+at once). Until then the home tab is served from the raw dataset's metadata
+(data_store.load_raw_metadata).
+"""
+import itertools
+import threading
+
+import numpy as np
+import pandas as pd
+
+from aggregates import build_aggregates
+from cross_filter import CrossFilter
+from geocoder import Geocoder
+from indexes import CauseIndex, CountryIndex, DateIndex, GeoIndex, TableIndex
+from token_index import TokenIndex
+
+TIME_PERIODS = ["Night", "Morning", "Afternoon", "Evening"]
+
+
+def add_derived_columns(df):
+    """
+    Return a copy of the cleaned dataset with the columns the charts derive from
+    it: Hour (nullable int) and Time_Period, the part of the day of the crash
+    (Night [0, 6), Morning [6, 12), Afternoon [12, 18), Evening [18, 24) or Unknown).
+    """
+    hour = pd.to_numeric(df["Time"].astype("string").str.split(":").str[0], errors="coerce")
+    hour = hour.where((hour >= 0) & (hour < 24) & (hour == np.floor(hour)))
+    period = pd.cut(hour, bins=[0, 6, 12, 18, 24], right=False, labels=TIME_PERIODS)
+    return df.assign(
+        Hour=hour.astype("Int8"),
+        Time_Period=period.cat.add_categories("Unknown").fillna("Unknown"),
+    )
+
+
+class DatasetSnapshot:
+    _versions = itertools.count(1)
+
+    def __init__(self, raw, clean, raw_metadata=None):
+        # `raw` is the raw frame or a function loading it
+        self.version = next(self._versions)
+        self._raw = raw
+        self.raw_metadata = raw_metadata
+        self._built = {}
+        self._build_lock = threading.RLock()
+        self.clean = add_derived_columns(clean)
+        self.aggregates = build_aggregates(self.clean)
+        self.date_index = DateIndex(self.clean["Date"])
+        self.country_index = CountryIndex(self.clean["Country"], self.clean["Fatalities"])
+        self.cause_index = CauseIndex(self.clean)
+        self.geo_index = GeoIndex(self.clean["Latitude"], self.clean["Longitude"])
+        self.cross_filter = CrossFilter(self.clean)
+        self._frozen = True
+
+    def _lazy(self, name, build):
+        # Built once, by the first request needing it
+        if name not in self._built:
+            with self._build_lock:
+                if name not in self._built:
+                    self._built[name] = build()
+        return self._built[name]
+
+    @property
+    def raw(self):
+        return self._lazy("raw", lambda: self._raw() if callable(self._raw) else self._raw)
+
+    @property
+    def token_index(self):
+        return self._lazy("token_index", lambda: TokenIndex.from_frame(self.clean))
+
+    @property
+    def table_index(self):
+        # The raw Date strings (MM/DD/YYYY) are sorted chronologically in the data table
+        return self._lazy("table_index", lambda: TableIndex(self.raw, sort_values={
+            "Date": pd.to_datetime(self.raw["Date"], format="%m/%d/%Y", errors="coerce")
+        }))
+
+    @property
+    def geocoder(self):
+        # Places typed in the radius search, resolved against this version's gazetteer
+        return self._lazy("geocoder", Geocoder)
+
+    def decades(self):
+        # Decades of the word cloud filter, without building the token index
+        years = self.clean.loc[self.clean["Summary"].map(lambda summary: isinstance(summary, str)), "Year"]
+        return sorted(int(decade) for decade in (years // 10 * 10).unique())
+
+    def materialize(self):
+        """
+        Build the lazily built parts now, e.g. before forking workers that share them.
+        """
+        self.table_index
+        self.token_index
+        return self
+
+    def raw_row_count(self):
+        """
+        Row count of the raw dataset from its metadata, or of the raw frame when it is
+        already loaded; NaN otherwise. Never loads the raw dataset.
+        """
+        if self.raw_metadata:
+            return self.raw_metadata["rows"]
+        if "raw" in self._built:
+            return len(self._built["raw"])
+        return float("nan")
+
+    def raw_overview(self, page_size):
+        """
+        Row count, columns, first data table page and page count of the raw dataset,
+        from its metadata when the raw frame has not been loaded.
+        """
+        metadata = self.raw_metadata
+        if "raw" not in self._built and metadata and len(metadata["preview"]) >= page_size:
+            rows = metadata["rows"]
+            return rows, metadata["columns"], metadata["preview"][:page_size], max(1, -(-rows // page_size))
+        records, page_count = self.table_index.page(0, page_size)
+        return len(self.raw), self.table_index.columns, records, page_count
+
+    def filtered_aggregates(self, filter_state):
+        """
+        Aggregate tables of the rows matching a normalized filter state
+        (see cross_filter.normalize_filter_state); the precomputed ones when nothing is filtered.
+        """
+        if not filter_state:
+            return self.aggregates
+        return self.cross_filter.aggregates(filter_state)
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("DatasetSnapshot is read-only, build a new snapshot instead.")
+        super().__setattr__(name, value)
+
+##############################################################################################################################
+# The snapshot served to the callbacks
+_current = None
+_publish_lock = threading.Lock()
+
+
+def current_snapshot():
+    # A single reference read: callbacks get either the old or the new snapshot, never a mix
+    return _current
+
+
+def publish(snapshot):
+    """
+    Atomically replace the served snapshot and return the previous one.
+    """
+    global _current
+    with _publish_lock:
+        previous, _current = _current, snapshot
+    return previous
@@ -0,0 +1,205 @@
+"""
+Synthetic crash records with the schema of Data/cleaned_airplane_crashes.csv,
+for testing the dashboard at scale.
+
+Every column is drawn from its marginal distribution in the cleaned dataset,
+with the relations between columns kept consistent:
+
+    - Date from the year, month and day-of-month distributions; Year, Month and
+      Day derived from it
+    - Time, Causes, Aboard, Fatality_Rate and Ground as sampled
+    - Fatalities from Aboard and the sampled rate, Fatality_Rate recomputed
+    - Location, Operator, Route and Type from their observed values, plus new
+      variants ("<value> <n>") so that their number of distinct values keeps
+      growing with the row count like in the real data (Heaps' law fitted on
+      the cleaned dataset); Operator_Type follows Operator and Country
+      follows Location
+    - Summary built from real sentences, with the real number of sentences per
+      summary
+
+Rows are generated and written in chunks, so memory does not depend on the
+number of rows. The same seed and chunk size give the same file.
+
+    python synthetic_data.py ROWS [--output PATH] [--seed N] [--chunk-size N]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import CLEAN_CSV, DATA_DIR, MONTH_ORDER, apply_clean_schema
+from preprocessing import OUTPUT_COLUMNS
+
+DEFAULT_CHUNK_SIZE = 500_000
+
+# Columns whose number of distinct values grows with the row count
+OPEN_COLUMNS = ["Location", "Operator", "Route", "Type"]
+
+# Sampled as they are
+CLOSED_COLUMNS = ["Time", "Causes", "Aboard", "Ground"]
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Summaries separate their sentences with two spaces
+SENTENCE_BREAK = r"(?<=\.)\s{2,}"
+
+
+def _distribution(column):
+    # Distinct values (missing values included) and their probabilities
+    codes, values = pd.factorize(column, use_na_sentinel=False)
+    counts = np.bincount(codes)
+    return np.asarray(values, dtype=object), counts / counts.sum()
+
+
+def _heaps_exponent(column, rng):
+    """
+    Exponent b of distinct(n) ~ n ** b, from the distinct values of a random half
+    of the column against the whole column.
+    """
+    half = column.iloc[rng.permutation(len(column))[:len(column) // 2]]
+    return np.log(column.nunique(dropna=False) / half.nunique(dropna=False)) / np.log(2)
+
+##############################################################################################################################
+# Generator
+class SyntheticCrashes:
+    def __init__(self, source=None, seed=0):
+        source = pd.read_csv(CLEAN_CSV) if source is None else source
+        self.rng = np.random.default_rng(seed)
+        self.source_rows = len(source)
+
+        dates = pd.to_datetime(source["Date"])
+        self.marginals = {
+            "year": _distribution(dates.dt.year),
+            "month": _distribution(dates.dt.month),
+            "day": _distribution(dates.dt.day),
+            "rate": _distribution(source["Fatality_Rate"]),
+        }
+        for column in CLOSED_COLUMNS:
+            self.marginals[column] = _distribution(source[column])
+
+        # Open columns: observed distribution, Heaps exponent and share of new values
+        self.open_columns = {}
+        for column in OPEN_COLUMNS:
+            values, probabilities = _distribution(source[column])
+            # Good-Turing: share of rows with a value not seen before
+            singletons = (source[column].value_counts(dropna=False) == 1).sum()
+            self.open_columns[column] = (
+                values, probabilities, _heaps_exponent(source[column], self.rng), singletons / len(source)
+            )
+        operator_types = dict(zip(source["Operator"], source["Operator_Type"]))
+        self.operator_types = np.asarray([operator_types[value] for value in self.open_columns["Operator"][0]])
+        countries = dict(zip(source["Location"], source["Country"]))
+        self.countries = np.asarray([countries[value] for value in self.open_columns["Location"][0]], dtype=object)
+
+        sentences = source["Summary"].str.split(SENTENCE_BREAK, regex=True)
+        self.sentences = np.asarray(sentences.explode().tolist(), dtype=object)
+        self.sentence_counts = _distribution(sentences.str.len())
+
+    def _sample(self, name, size):
+        values, probabilities = self.marginals[name]
+        return values[self.rng.choice(len(values), size, p=probabilities)]
+
+    def _open_column(self, column, size, total_rows):
+        """
+        Values of an open column for a chunk of a `total_rows` dataset: observed values,
+        or one of the variants needed to reach the extrapolated number of distinct values.
+        Also returns the index of the observed value each one is based on.
+        """
+        values, probabilities, exponent, novel_share = self.open_columns[column]
+        variants = int(len(values) * (total_rows / self.source_rows) ** exponent) - len(values)
+        bases = self.rng.choice(len(values), size, p=probabilities)
+        out = values[bases]
+        if variants > 0:
+            novel = np.flatnonzero(self.rng.random(size) < novel_share)
+            variant = self.rng.integers(0, variants, len(novel))
+            # Variant i is the i-th distinct value with a number
+            bases[novel] = variant % len(values)
+            names = pd.Series(values[bases[novel]]).astype(str) + " " + (variant // len(values) + 1).astype(str)
+            out[novel] = names.to_numpy(dtype=object)
+        return out, bases
+
+    def _summaries(self, size):
+        values, probabilities = self.sentence_counts
+        counts = values[self.rng.choice(len(values), size, p=probabilities)].astype(np.int64)
+        picked = self.sentences[self.rng.integers(0, len(self.sentences), counts.sum())]
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        return ["  ".join(picked[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def chunk(self, size, total_rows=None):
+        """
+        DataFrame of `size` rows, with the columns of the cleaned CSV. `total_rows` is the
+        size of the whole dataset, which sets the cardinality of the open columns.
+        """
+        total_rows = total_rows or size
+
+        # Dates: year and month as sampled, day of the month capped to the month length
+        years = self._sample("year", size).astype(np.int64)
+        months = ((years - 1970) * 12 + self._sample("month", size).astype(np.int64) - 1).astype("datetime64[M]")
+        month_days = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+        day = np.minimum(self._sample("day", size).astype(np.int64), month_days)
+        dates = months.astype("datetime64[D]") + (day - 1)
+        # 1970-01-01 was a Thursday
+        weekdays = (dates.astype(np.int64) + 3) % 7
+
+        aboard = self._sample("Aboard", size).astype(np.int64)
+        fatalities = np.minimum(np.round(aboard * self._sample("rate", size).astype(float)), aboard).astype(np.int64)
+        rate = np.where(aboard > 0, np.round(fatalities / np.maximum(aboard, 1), 2), 0.0)
+
+        operators, operator_bases = self._open_column("Operator", size, total_rows)
+        locations, location_bases = self._open_column("Location", size, total_rows)
+        df = pd.DataFrame({
+            "Date": dates.astype(str),
+            "Year": dates.astype("datetime64[Y]").astype(np.int64) + 1970,
+            "Month": np.asarray(MONTH_ORDER)[months.astype(np.int64) % 12],
+            "Day": np.asarray(DAY_NAMES)[weekdays],
+            "Time": self._sample("Time", size),
+            # Variants keep the country of the location they are based on
+            "Country": self.countries[location_bases],
+            "Location": locations,
+            "Operator": operators,
+            # Variants keep the operator type of the operator they are based on
+            "Operator_Type": self.operator_types[operator_bases],
+            "Route": self._open_column("Route", size, total_rows)[0],
+            "Type": self._open_column("Type", size, total_rows)[0],
+            "Aboard": aboard,
+            "Fatalities": fatalities,
+            "Fatality_Rate": rate,
+            "Ground": self._sample("Ground", size).astype(np.int64),
+            "Causes": self._sample("Causes", size),
+            "Summary": self._summaries(size),
+        })
+        return df[OUTPUT_COLUMNS]
+
+    def chunks(self, n_rows, chunk_size=DEFAULT_CHUNK_SIZE):
+        for start in range(0, n_rows, chunk_size):
+            yield self.chunk(min(chunk_size, n_rows - start), n_rows)
+
+
+def synthetic_frame(n_rows, seed=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    In-memory synthetic dataset with the typed schema of load_clean_data().
+    """
+    generator = SyntheticCrashes(seed=seed)
+    return apply_clean_schema(pd.concat(generator.chunks(n_rows, chunk_size), ignore_index=True))
+
+
+def write_csv(path, n_rows, seed=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    generator = SyntheticCrashes(seed=seed)
+    for i, chunk in enumerate(generator.chunks(n_rows, chunk_size)):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic crash records for scale testing.")
+    parser.add_argument("rows", type=int, help="number of rows")
+    parser.add_argument("--output", help="CSV file to write (default: Data/synthetic_<rows>.csv)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows generated per chunk")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(DATA_DIR, f"synthetic_{args.rows}.csv")
+    start = time.perf_counter()
+    write_csv(output, args.rows, args.seed, args.chunk_size)
+    print(f"✓ {args.rows:,} rows written to: {output} ({time.perf_counter() - start:.1f} s)")
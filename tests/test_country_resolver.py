@@ -0,0 +1,79 @@
+"""
+CountryResolver against the notebook's extract_country, on locations of a
+synthetic sample. The notebook version is slow (one fuzzy scan of every country
+name per word), so the sample is small. Run from the repository root:
+
+    python -m pytest tests
+"""
+import os
+import re
+import sys
+import warnings
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+pytest.importorskip("pycountry")
+process = pytest.importorskip("fuzzywuzzy.process")
+
+from country_resolver import CountryResolver, US_STATE_ABBREVIATIONS, US_STATE_NAMES  # noqa: E402
+from synthetic_data import synthetic_frame  # noqa: E402
+
+SAMPLE_SIZE = 50
+
+EDGE_CASES = [
+    None,
+    "",
+    "Near Anchorage, Alaska",
+    "Off the coast of Kodiak, AK",
+    "Over the Atlantic Ocean",
+    "Moscow, Russia",
+    "Sao Paulo, Brazil",
+    "Kent, England",
+]
+
+
+def notebook_extract_country(location_text, country_list):
+    # extract_country from notebook/preprocessing.ipynb
+    if pd.isna(location_text):
+        return None
+    location_upper = location_text.upper()
+    for state in US_STATE_NAMES:
+        if state.upper() in location_upper:
+            return 'USA'
+    location_words = re.findall(r"\b[A-Za-z]+\b", location_text)
+    for word in location_words:
+        if word.upper() in US_STATE_ABBREVIATIONS:
+            return 'USA'
+    words = re.findall(r"[A-Za-z]+", location_text)
+    best_match = None
+    best_score = 0
+    for word in words:
+        match, score = process.extractOne(word, country_list)
+        if score > best_score:
+            best_match = match
+            best_score = score
+    if best_score >= 85:
+        return best_match
+    return None
+
+
+def test_resolve_matches_the_notebook():
+    locations = synthetic_frame(2_000, seed=0)["Location"].astype(object).drop_duplicates()
+    locations = pd.concat([
+        locations.sample(SAMPLE_SIZE, random_state=0),
+        pd.Series(EDGE_CASES, dtype=object),
+    ], ignore_index=True)
+
+    resolver = CountryResolver()
+    with warnings.catch_warnings():
+        # fuzzywuzzy warns about the slow pure-Python SequenceMatcher
+        warnings.simplefilter("ignore")
+        expected = locations.apply(notebook_extract_country, country_list=resolver.countries)
+    resolved = resolver.resolve(locations)
+
+    assert resolved.index.equals(locations.index)
+    pd.testing.assert_series_equal(resolved.fillna(""), expected.fillna(""), check_names=False, check_dtype=False)
@@ -0,0 +1,75 @@
+"""
+The cross-filtering engine against pandas: masks against boolean indexing of the
+frame, aggregate tables against build_aggregates on the filtered rows. Run from
+the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aggregates import build_aggregates  # noqa: E402
+from cross_filter import FILTER_COLUMNS, CrossFilter, normalize_filter_state  # noqa: E402
+from snapshot import add_derived_columns  # noqa: E402
+from synthetic_data import synthetic_frame  # noqa: E402
+
+FILTER_STATES = [
+    {},
+    {"years": [1950, 1979]},
+    {"years": [1900, 1900]},
+    {"operator_types": ["Civilian"]},
+    {"countries": ["USA", "Russian Federation", "France", "Brazil"]},
+    {"causes": ["Weather"], "months": ["December", "January", "February"]},
+    {
+        "years": [1960, 1999], "operator_types": ["Civilian"], "countries": ["USA", "Canada"],
+        "causes": ["Weather", "Pilot Error"], "months": ["March", "July", "August"],
+    },
+    # No row matches
+    {"countries": ["Atlantis"]},
+]
+
+
+@pytest.fixture(scope="module")
+def df():
+    return add_derived_columns(synthetic_frame(20_000, seed=0))
+
+
+@pytest.fixture(scope="module")
+def cross_filter(df):
+    return CrossFilter(df)
+
+
+def pandas_mask(df, filter_state):
+    mask = np.ones(len(df), dtype=bool)
+    if "years" in filter_state:
+        start, end = filter_state["years"]
+        mask &= df["Year"].between(start, end).to_numpy()
+    for key, column in FILTER_COLUMNS.items():
+        if key in filter_state:
+            mask &= df[column].isin(filter_state[key]).to_numpy()
+    return mask
+
+
+@pytest.mark.parametrize("filter_state", FILTER_STATES)
+def test_mask_matches_pandas(df, cross_filter, filter_state):
+    mask = cross_filter.mask(normalize_filter_state(filter_state))
+    expected = pandas_mask(df, filter_state)
+    if mask is None:
+        assert expected.all()
+    else:
+        np.testing.assert_array_equal(mask, expected)
+
+
+@pytest.mark.parametrize("filter_state", FILTER_STATES)
+def test_aggregates_match_build_aggregates(df, cross_filter, filter_state):
+    tables = cross_filter.aggregates(normalize_filter_state(filter_state))
+    reference = build_aggregates(df[pandas_mask(df, filter_state)])
+    assert set(tables) >= set(reference)
+    for name, table in reference.items():
+        assert tables[name].equals(table), name
@@ -0,0 +1,63 @@
+"""
+Viewports and binning of the crash point map around the antimeridian. Run from
+the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from point_map import bin_points, cell_size, map_view, snap_bounds, viewport  # noqa: E402
+
+
+def view(lat, lon, zoom):
+    return {"map.center": {"lat": lat, "lon": lon}, "map.zoom": zoom}
+
+
+def test_panned_around_the_globe_is_the_same_view():
+    assert map_view(view(20, 300, 4)) == map_view(view(20, -60, 4))
+
+
+def test_viewport_crossing_the_antimeridian():
+    level, (west, south, east, north) = viewport(view(-18, 180, 4))
+    assert level == 4
+    assert west > east
+    assert 90 < west < 180 and -180 < east < -90
+
+
+def test_corner_coordinates_are_wrapped():
+    relayout_data = dict(view(0, 200, 5), **{"map._derived": {"coordinates": [
+        [170, 10], [230, 10], [230, -10], [170, -10],
+    ]}})
+    assert viewport(relayout_data) == (5, (170, -10, -130, 10))
+
+
+def test_events_without_a_view_keep_the_initial_view():
+    assert map_view({"selections": []}) == map_view({"autosize": True}) == map_view(None)
+
+
+def test_snapped_bounds_stay_across_the_antimeridian():
+    assert snap_bounds((179.5, -1.0, -179.5, 1.0), 1.0) == (179.0, -1.0, -179.0, 1.0)
+    assert snap_bounds((-179.5, -1.0, -179.9, 1.0), 1.0) == (-180.0, -1.0, 180.0, 1.0)
+
+
+def test_bin_points_across_the_antimeridian():
+    latitude = np.array([-18.0, -17.5, -18.2, 10.0, -18.0], dtype=np.float32)
+    longitude = np.array([178.4, 179.9, -179.8, 178.0, 0.0], dtype=np.float32)
+    fatalities = np.array([1, 2, 3, 4, 5])
+    bounds = (170.0, -30.0, -170.0, 0.0)
+
+    points, in_view = bin_points(latitude, longitude, fatalities, bounds, cell_size(4))
+    assert list(in_view) == [0, 1, 2]
+
+    # Binned: crashes on both sides of the antimeridian share a cell of the global grid
+    points, in_view = bin_points(latitude, longitude, fatalities, bounds, 22.5, max_points=0)
+    assert in_view is None
+    assert points["Crashes"].sum() == 3
+    assert points["Fatalities"].sum() == 6
+    assert ((points["Longitude"] > 170) | (points["Longitude"] < -170)).all()
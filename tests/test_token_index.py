@@ -0,0 +1,50 @@
+"""
+TokenIndex frequencies against WordCloud.process_text on the text of the
+matching summaries, on a synthetic sample. Run from the repository root:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+wordcloud = pytest.importorskip("wordcloud")
+
+from synthetic_data import synthetic_frame  # noqa: E402
+from token_index import TokenIndex, summary_stopwords  # noqa: E402
+
+FILTERS = [
+    {},
+    {"causes": ["Weather"]},
+    {"decades": [1970, 1980]},
+    {"operator_types": ["Military"]},
+    {"causes": ["Pilot Error", "Mechanical Failure"], "decades": [1950], "operator_types": ["Civilian"]},
+]
+
+
+@pytest.fixture(scope="module")
+def df():
+    df = synthetic_frame(3_000, seed=0)
+    return df.assign(Decade=df["Year"] // 10 * 10)
+
+
+@pytest.fixture(scope="module")
+def token_index(df):
+    return TokenIndex.from_frame(df)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_frequencies_match_process_text(df, token_index, filters):
+    rows = df
+    for key, column in [("causes", "Causes"), ("decades", "Decade"), ("operator_types", "Operator_Type")]:
+        if filters.get(key):
+            rows = rows[rows[column].isin(filters[key])]
+    assert len(rows) > 0
+
+    cloud = wordcloud.WordCloud(stopwords=summary_stopwords(), collocations=False)
+    expected = cloud.process_text(" ".join(rows["Summary"].dropna()))
+    assert token_index.frequencies(**filters) == expected
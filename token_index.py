@@ -0,0 +1,151 @@
+"""
+Token-frequency index over the accident summaries, behind the word clouds.
+
+Summaries are tokenized once, the way WordCloud.generate does it, and the token
+counts are stored per (Causes, decade, Operator_Type) cell. The frequencies of any
+filter combination are the sum of the matching cells, so a filtered word cloud is
+rendered with `generate_from_frequencies` without re-reading any text. New rows
+can be added to an existing index with `add`.
+"""
+import base64
+import io
+import re
+from collections import Counter, defaultdict
+
+from data_store import STOPWORDS
+
+# Words dropped from the clouds on top of the standard English stopwords (Data/stopwords_english.txt)
+EXTRA_STOPWORDS = [
+    "aircraft", "plane", "pilot", "flight", "crashed", "crash", "airplane",
+    "airport", "landing", "takeoff", "feet", "altitude", "passengers",
+    "crew", "runway", "air", "ground", "approach", "departure",
+    "minutes", "hours", "time", "reported", "taking", "conditions",
+    "engine", "weather", "mountain", "land", "failure"
+]
+
+# Word cloud look shared by the dashboard and build_wordcloud.py
+WORDCLOUD_OPTIONS = dict(
+    width=1200,
+    height=600,
+    background_color="#0E1117",
+    colormap="Reds",
+    max_words=100,
+    relative_scaling=0.5,
+    min_font_size=10,
+    prefer_horizontal=0.7,
+    collocations=False,
+    random_state=42,
+)
+
+TOKEN_PATTERN = re.compile(r"\w[\w']*")
+
+
+def summary_stopwords(path=STOPWORDS):
+    """
+    The English stopwords shipped in Data/stopwords_english.txt (WordCloud's STOPWORDS
+    and NLTK's English stopwords) and EXTRA_STOPWORDS, all lower case. The list is
+    read from the repository, so every word cloud drops the same words whatever is
+    installed.
+    """
+    with open(path, encoding="utf-8") as f:
+        words = {line.strip() for line in f if line.strip() and not line.startswith("#")}
+    return {word.lower() for word in words | set(EXTRA_STOPWORDS)}
+
+
+def tokenize(text, stopwords):
+    """
+    Tokens of one text as WordCloud.process_text keeps them: 's removed, numbers
+    and stopwords dropped, original case preserved.
+    """
+    for word in TOKEN_PATTERN.findall(text):
+        if word.lower().endswith("'s"):
+            word = word[:-2]
+        if word.isdigit() or word.lower() in stopwords:
+            continue
+        yield word
+
+
+def normalize_counts(counts, first_seen):
+    """
+    Fuse the cases of each word (keeping the most common one, ties going to the
+    first seen) and merge plurals into their singular, like
+    wordcloud.tokenization.process_tokens.
+    """
+    cases = defaultdict(dict)
+    for word in sorted(counts, key=first_seen.__getitem__):
+        cases[word.lower()][word] = counts[word]
+    for key in list(cases):
+        if key.endswith("s") and not key.endswith("ss") and key[:-1] in cases:
+            singular_cases = cases[key[:-1]]
+            for word, count in cases.pop(key).items():
+                singular_cases[word[:-1]] = singular_cases.get(word[:-1], 0) + count
+    return {
+        max(case_counts.items(), key=lambda item: item[1])[0]: sum(case_counts.values())
+        for case_counts in cases.values()
+    }
+
+
+class TokenIndex:
+    def __init__(self, stopwords=None):
+        self.stopwords = summary_stopwords() if stopwords is None else stopwords
+        self.cells = defaultdict(Counter)
+        # Position of each token's first occurrence per cell, to break ties like WordCloud
+        # does on the text of the matching rows only
+        self.first_seen = defaultdict(dict)
+        self._positions = 0
+
+    @classmethod
+    def from_frame(cls, df, stopwords=None):
+        index = cls(stopwords)
+        index.add(df["Summary"], df["Causes"], df["Year"] // 10 * 10, df["Operator_Type"])
+        return index
+
+    def add(self, summaries, causes, decades, operator_types):
+        # Streams over the rows: one tokenization per summary, counted into its cell
+        for summary, cause, decade, operator_type in zip(summaries, causes, decades, operator_types):
+            if not isinstance(summary, str):
+                continue
+            tokens = list(tokenize(summary, self.stopwords))
+            cell = (cause, int(decade), operator_type)
+            first_seen = self.first_seen[cell]
+            for position, token in enumerate(tokens, self._positions):
+                first_seen.setdefault(token, position)
+            self._positions += len(tokens)
+            self.cells[cell].update(tokens)
+
+    def decades(self):
+        return sorted({decade for _, decade, _ in self.cells})
+
+    def frequencies(self, causes=None, decades=None, operator_types=None):
+        """
+        Word frequencies of the rows matching every given filter (None or empty = no filter).
+        """
+        total = Counter()
+        first_seen = {}
+        for (cause, decade, operator_type), counts in self.cells.items():
+            if causes and cause not in causes:
+                continue
+            if decades and decade not in decades:
+                continue
+            if operator_types and operator_type not in operator_types:
+                continue
+            total.update(counts)
+            for token, position in self.first_seen[(cause, decade, operator_type)].items():
+                if position < first_seen.get(token, position + 1):
+                    first_seen[token] = position
+        return normalize_counts(total, first_seen)
+
+
+def wordcloud_image(frequencies, **options):
+    """
+    Render frequencies as a PNG data URI, or None when there is nothing to draw.
+    """
+    from wordcloud import WordCloud
+
+    if not frequencies:
+        return None
+    options = {**WORDCLOUD_OPTIONS, **options}
+    cloud = WordCloud(**options).generate_from_frequencies(frequencies)
+    buffer = io.BytesIO()
+    cloud.to_image().save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()